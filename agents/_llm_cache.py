@@ -0,0 +1,289 @@
+"""
+Response caching for Groq chat completions shared by the agents.
+"""
+import hashlib
+import json
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter, deque
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Optional
+from groq import Groq
+
+
+DEFAULT_THRESHOLD = 0.9
+MAX_CACHEABLE_TEMPERATURE = 0.8
+DEFAULT_TTL_SECONDS = 3600
+
+_TOKEN_RE = re.compile(r"[a-z0-9_+#]+")
+_STOP_WORDS = frozenset({
+    'a', 'an', 'the', 'to', 'for', 'of', 'in', 'on', 'with', 'and', 'or', 'is', 'it',
+    'me', 'my', 'please', 'can', 'you', 'write', 'create', 'make', 'generate', 'code',
+})
+
+
+def _content_tokens(text: str) -> tuple:
+    """Lowercased words of the text in order, without stop words and punctuation."""
+    return tuple(t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOP_WORDS)
+
+
+def _bag_of_words(text: str) -> Dict[str, float]:
+    """Default embedding: unigram + bigram counts of the lowercased content words."""
+    tokens = _content_tokens(text)
+    features = Counter(tokens)
+    features.update(' '.join(pair) for pair in zip(tokens, tokens[1:]))
+    return dict(features)
+
+
+def _cosine(a: Dict[str, float], b: Dict[str, float], norm_a: float, norm_b: float) -> float:
+    """Cosine similarity between two sparse vectors."""
+    if not norm_a or not norm_b:
+        return 0.0
+    if len(a) > len(b):
+        a, b = b, a
+    dot = sum(value * b.get(key, 0.0) for key, value in a.items())
+    return dot / (norm_a * norm_b)
+
+
+class SemanticCache:
+    """
+    In-process semantic cache for LLM responses.
+    
+    Entries are partitioned by their metadata (model, temperature, language, ...)
+    so a response is only reused for a call made with identical settings. Within
+    a partition, a lookup only considers cached prompts with the same content
+    words in the same order, so prompts differing only in case, punctuation,
+    whitespace or stop words share a response. Word-overlap similarity alone is
+    not enough: long prompts that differ in one word ("csv" / "json",
+    "ascending" / "descending") score above any useful threshold.
+    
+    Among the candidates, the most similar one is returned if its cosine
+    similarity reaches the threshold. With the default bag-of-words embedding,
+    equal token sequences always score 1.0, so the threshold only matters when
+    a custom embed function is passed.
+    """
+    
+    def __init__(self, embed: Optional[Callable[[str], Dict[str, float]]] = None,
+                 max_entries: int = 256):
+        """
+        Initialize the cache.
+        
+        Args:
+            embed: Function mapping text to a sparse {feature: weight} vector.
+                Defaults to a lexical bag-of-words embedding.
+            max_entries: Maximum number of entries kept per metadata partition
+        """
+        self.embed = embed or _bag_of_words
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _partition(meta: dict) -> str:
+        return json.dumps(meta, sort_keys=True, default=str)
+    
+    @staticmethod
+    def _cacheable(meta: dict) -> bool:
+        return meta.get('temperature', 0) <= MAX_CACHEABLE_TEMPERATURE
+    
+    def get(self, prompt: str, meta: dict, threshold: float = DEFAULT_THRESHOLD) -> Optional[str]:
+        """
+        Look up a cached response for a prompt similar to the given one.
+        
+        Args:
+            prompt: Text the similarity is computed on
+            meta: Call settings the cached response must have been produced with
+            threshold: Minimum cosine similarity for a hit (only relevant with
+                a custom embed function)
+        
+        Returns:
+            The cached response, or None on a miss
+        """
+        if not self._cacheable(meta):
+            return None
+        
+        tokens = _content_tokens(prompt)
+        with self._lock:
+            entries = [
+                entry for entry in self._entries.get(self._partition(meta), ())
+                if entry[0] == tokens
+            ]
+        if not entries:
+            return None
+        
+        vector = self.embed(prompt)
+        norm = math.sqrt(sum(v * v for v in vector.values()))
+        
+        best_score, best_response = 0.0, None
+        for _, entry_vector, entry_norm, response in entries:
+            score = _cosine(vector, entry_vector, norm, entry_norm)
+            if score > best_score:
+                best_score, best_response = score, response
+        
+        return best_response if best_score >= threshold else None
+    
+    def set(self, prompt: str, meta: dict, response: str):
+        """
+        Store a response for a prompt.
+        
+        Args:
+            prompt: Text the similarity is computed on
+            meta: Call settings the response was produced with
+            response: Response text to cache
+        """
+        if not self._cacheable(meta):
+            return
+        
+        vector = self.embed(prompt)
+        norm = math.sqrt(sum(v * v for v in vector.values()))
+        
+        with self._lock:
+            partition = self._entries.setdefault(
+                self._partition(meta), deque(maxlen=self.max_entries)
+            )
+            partition.append((_content_tokens(prompt), vector, norm, response))
+    
+    def clear(self):
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+class ResponseCache:
+    """
+    Exact-match LLM response cache persisted in SQLite.
+    
+    Keys are SHA-256 hashes of the full request (prompt and call settings),
+    so a hit is only returned for a byte-identical request.
+    """
+    
+    def __init__(self, db_path: Path, ttl: int = DEFAULT_TTL_SECONDS):
+        """
+        Initialize the cache.
+        
+        Args:
+            db_path: Path of the SQLite database file
+            ttl: Seconds after which an entry expires
+        """
+        self.db_path = str(db_path)
+        self.ttl = ttl
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, response TEXT, created_at INTEGER)"
+            )
+    
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=5)
+    
+    @staticmethod
+    def make_key(**parts) -> str:
+        """Hash the request parts into a cache key."""
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None if missing or expired."""
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT response FROM responses WHERE key = ? AND created_at >= ?",
+                    (key, int(time.time()) - self.ttl)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+    
+    def set(self, key: str, response: str):
+        """Store a response under a key."""
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, created_at) VALUES (?, ?, ?)",
+                    (key, response, int(time.time()))
+                )
+        except sqlite3.Error:
+            pass
+
+
+# Process-wide cache shared by all agent instances
+semantic_cache = SemanticCache()
+
+
+@lru_cache(maxsize=4)
+def get_groq_client(api_key: str) -> Groq:
+    """
+    Return the process-wide Groq client for an API key.
+    
+    Agents share one client so requests reuse its keep-alive connection pool
+    instead of paying a new TLS handshake per agent instance.
+    """
+    return Groq(api_key=api_key)
+
+
+def cached_completion(client, prompt: str, *, model: str, temperature: float, max_tokens: int,
+                      cache_text: Optional[str] = None, meta: Optional[dict] = None,
+                      threshold: float = DEFAULT_THRESHOLD,
+                      cache: Optional[SemanticCache] = None,
+                      response_cache: Optional[ResponseCache] = None,
+                      use_semantic_cache: bool = True, **create_kwargs) -> str:
+    """
+    Run a single-message chat completion through the response caches.
+    
+    The exact-match cache (if given) is checked first, then the semantic cache.
+    
+    Args:
+        client: Groq client
+        prompt: Full prompt sent to the model
+        model: Model ID
+        temperature: Sampling temperature
+        max_tokens: Completion token limit
+        cache_text: Text used for similarity lookup (defaults to the prompt).
+            Pass the variable part of templated prompts so the shared template
+            text does not dominate the similarity score.
+        meta: Extra call settings that must match for a cache hit (e.g. language)
+        threshold: Minimum cosine similarity for a semantic hit (only relevant
+            with a cache using a custom embed function)
+        cache: Semantic cache to use (defaults to the process-wide cache)
+        response_cache: Optional exact-match cache
+        use_semantic_cache: Set to False for prompts where only an exact match
+            may be reused (e.g. summaries of different documents)
+        **create_kwargs: Extra arguments forwarded to chat.completions.create
+    
+    Returns:
+        The stripped response content
+    """
+    cache = cache or semantic_cache
+    cache_text = prompt if cache_text is None else cache_text
+    meta = {'model': model, 'temperature': temperature, 'max_tokens': max_tokens, **(meta or {})}
+    
+    key = None
+    if response_cache is not None and temperature <= MAX_CACHEABLE_TEMPERATURE:
+        key = ResponseCache.make_key(prompt=prompt, **meta)
+        cached = response_cache.get(key)
+        if cached is not None:
+            return cached
+    
+    if use_semantic_cache:
+        cached = cache.get(cache_text, meta, threshold)
+        if cached is not None:
+            return cached
+    
+    response = client.chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=temperature,
+        max_tokens=max_tokens,
+        **create_kwargs
+    )
+    content = response.choices[0].message.content.strip()
+    
+    if use_semantic_cache:
+        cache.set(cache_text, meta, content)
+    if key is not None:
+        response_cache.set(key, content)
+    return content
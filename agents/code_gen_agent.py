@@ -1,17 +1,57 @@
 """
 Code Generation Agent using Groq API.
 """
-from groq import Groq
-from .tools import FileSystemTools
+import asyncio
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from .tools import FileSystemTools, get_fs_tools
+from ._llm_cache import cached_completion, get_groq_client, semantic_cache, ResponseCache
+
+
+# Worker threads for filesystem writes that overlap with Groq requests
+_IO_POOL = ThreadPoolExecutor(max_workers=4)
+
+# Words ignored when deriving a filename from the prompt
+_STOP_WORDS = frozenset({'a', 'an', 'the', 'to', 'for', 'of', 'in', 'on', 'with', 'write', 'create', 'make', 'code'})
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Fenced markdown code blocks, with an optional language tag
+_FENCE_RE = re.compile(r"```[a-zA-Z0-9_+-]*\n?(.*?)```", re.DOTALL)
+
+
+def _strip_code_fences(text: str) -> str:
+    """Return the contents of all fenced code blocks, or the text itself if there are none."""
+    matches = _FENCE_RE.findall(text)
+    return '\n'.join(m.strip() for m in matches) if matches else text
+
+
+# Short snippets without any of these are not sent for an LLM review
+_REVIEW_MIN_LINES = 30
+_REVIEW_RED_FLAGS = ("subprocess", "eval(", "exec(", "pickle", "os.system", "__import__", "shell=True")
+_AUTO_REVIEW = "Auto-reviewed: short snippet, no sensitive API calls detected."
+
+# Lines of long code kept from the start and end when building the review prompt
+_REVIEW_HEAD_LINES = 80
+_REVIEW_TAIL_LINES = 40
+
+
+def _needs_review(code: str) -> bool:
+    """Return True if the code is long or uses sensitive APIs."""
+    return code.count('\n') + 1 >= _REVIEW_MIN_LINES or any(flag in code for flag in _REVIEW_RED_FLAGS)
 
 
 class CodeGenerationAgent:
     """Agent that generates code, reviews it, and saves to filesystem using Groq."""
     
-    def __init__(self, api_key: str, fs_tools: FileSystemTools):
-        self.client = Groq(api_key=api_key)
+    def __init__(self, api_key: str, fs_tools: FileSystemTools, client=None):
+        self.client = client or get_groq_client(api_key)
         self.fs_tools = fs_tools
         self.model_id = "llama-3.3-70b-versatile"  # Groq's best model
+        self.fast_model_id = "llama-3.1-8b-instant"  # Used for short reviews
+        self.cache = semantic_cache
+        self.response_cache = ResponseCache(fs_tools.base_dir / '.llm_cache.db')
     
     def generate_code(self, user_prompt: str, language: str = 'python') -> dict:
         """
@@ -25,42 +65,33 @@ class CodeGenerationAgent:
             dict with generated code, review, and file path
         """
         try:
-            # Step 1: Generate code with structured template
-            generation_prompt = self._create_generation_template(user_prompt, language)
+            # Step 1: Generate and review the code in a single JSON-mode request
+            combined = self._generate_with_review(user_prompt, language)
             
-            response = self.client.chat.completions.create(
-                model=self.model_id,
-                messages=[{"role": "user", "content": generation_prompt}],
-                temperature=0.7,
-                max_tokens=2000
-            )
+            if combined is not None:
+                generated_code, review_result = combined
+            else:
+                # Fall back to a separate generation request; the review follows below
+                generated_code = self._generate_only(user_prompt, language)
+                review_result = None
             
-            generated_code = response.choices[0].message.content.strip()
-            
-            # Extract code from markdown code blocks if present
-            if '```' in generated_code:
-                lines = generated_code.split('\n')
-                code_lines = []
-                in_code_block = False
-                for line in lines:
-                    if line.startswith('```'):
-                        in_code_block = not in_code_block
-                        continue
-                    if in_code_block:
-                        code_lines.append(line)
-                generated_code = '\n'.join(code_lines)
-            
-            # Step 2: Review the generated code
-            review_result = self._review_code(generated_code, language, user_prompt)
-            
-            # Step 3: Save to filesystem
+            # Step 2: Save to filesystem in the background while the review runs
             filename = self._generate_filename(user_prompt, language)
-            save_result = self.fs_tools.save_code_to_file(
+            save_future = _IO_POOL.submit(
+                self.fs_tools.save_code_to_file,
                 code=generated_code,
                 filename=filename,
                 language=language
             )
             
+            if review_result is None:
+                if _needs_review(generated_code):
+                    review_result = self._review_code(generated_code, language, user_prompt)
+                else:
+                    review_result = _AUTO_REVIEW
+            
+            save_result = save_future.result()
+            
             return {
                 'status': 'success',
                 'code': generated_code,
@@ -80,6 +111,96 @@ class CodeGenerationAgent:
                 'message': f'Error generating code: {str(e)}'
             }
     
+    async def agenerate_code(self, user_prompt: str, language: str = 'python') -> dict:
+        """
+        Async variant of generate_code for use from async views.
+        
+        Runs the blocking Groq and filesystem calls in a worker thread so the
+        event loop can serve other requests meanwhile.
+        """
+        return await asyncio.to_thread(self.generate_code, user_prompt, language)
+    
+    def _generate_with_review(self, user_prompt: str, language: str):
+        """
+        Generate code and its review with one JSON-mode Groq request.
+        
+        Returns:
+            (code, review) tuple, or None if the request or JSON parsing fails
+        """
+        try:
+            response_text = cached_completion(
+                self.client,
+                self._create_combined_template(user_prompt, language),
+                model=self.model_id,
+                temperature=0.7,
+                max_tokens=2500,
+                cache_text=user_prompt,
+                meta={'language': language, 'task': 'generate_and_review'},
+                cache=self.cache,
+                response_cache=self.response_cache,
+                response_format={"type": "json_object"}
+            )
+            
+            result = json.loads(response_text)
+            code, review = result.get('code'), result.get('review')
+            if not isinstance(code, str) or not code.strip() or not isinstance(review, str):
+                return None
+            
+            return _strip_code_fences(code.strip()), review.strip()
+            
+        except Exception:
+            return None
+    
+    def _generate_only(self, user_prompt: str, language: str) -> str:
+        """Generate code with the plain-text template and strip markdown fences."""
+        generation_prompt = self._create_generation_template(user_prompt, language)
+        
+        generated_code = cached_completion(
+            self.client,
+            generation_prompt,
+            model=self.model_id,
+            temperature=0.7,
+            max_tokens=2000,
+            cache_text=user_prompt,
+            meta={'language': language, 'task': 'generate'},
+            cache=self.cache,
+            response_cache=self.response_cache
+        )
+        
+        # Extract code from markdown code blocks if present
+        return _strip_code_fences(generated_code)
+    
+    def _create_combined_template(self, user_prompt: str, language: str) -> str:
+        """Create a template asking for the code and its review as one JSON object."""
+        template = f"""You are an expert {language} programmer and a senior code reviewer.
+
+USER REQUEST: {user_prompt}
+
+INSTRUCTIONS:
+1. Write production-quality {language} code that fulfills the user's request
+2. Include clear comments explaining the logic
+3. Follow {language} best practices and style guidelines
+4. Make the code modular and reusable
+5. Include error handling where appropriate
+6. Add docstrings/documentation for functions and classes
+
+Then review the code you wrote, covering:
+1. **Correctness**: Does it fulfill the requirements?
+2. **Quality**: Code organization, readability, best practices
+3. **Security**: Any potential security issues?
+4. **Performance**: Any performance concerns?
+5. **Suggestions**: 1-2 key improvements (if any)
+
+Keep the review brief and actionable (200 words max).
+
+Respond with a JSON object with exactly two string keys:
+{{
+  "code": "the complete {language} source code, without markdown formatting",
+  "review": "the markdown-formatted review"
+}}
+"""
+        return template
+    
     def _create_generation_template(self, user_prompt: str, language: str) -> str:
         """Create a structured template for code generation."""
         template = f"""You are an expert {language} programmer. Generate clean, efficient, and well-documented code.
@@ -101,13 +222,24 @@ Generate ONLY the code, without additional explanations or markdown formatting.
     def _review_code(self, code: str, language: str, original_prompt: str) -> str:
         """Review the generated code for quality and correctness."""
         try:
+            # Long code is reviewed from its head and tail to bound the prompt size
+            lines = code.splitlines()
+            if len(lines) > _REVIEW_HEAD_LINES + _REVIEW_TAIL_LINES:
+                code_for_review = '\n'.join(
+                    lines[:_REVIEW_HEAD_LINES]
+                    + ["# ... [middle elided for review] ..."]
+                    + lines[-_REVIEW_TAIL_LINES:]
+                )
+            else:
+                code_for_review = code
+            
             review_prompt = f"""You are a senior code reviewer. Review this {language} code and provide constructive feedback.
 
 ORIGINAL REQUEST: {original_prompt}
 
 CODE TO REVIEW:
 ```{language}
-{code}
+{code_for_review}
 ```
 
 Provide a concise review covering:
@@ -120,40 +252,38 @@ Provide a concise review covering:
 Keep the review brief and actionable (200 words max).
 """
             
-            response = self.client.chat.completions.create(
-                model=self.model_id,
-                messages=[{"role": "user", "content": review_prompt}],
+            return cached_completion(
+                self.client,
+                review_prompt,
+                model=self.fast_model_id,
                 temperature=0.5,
-                max_tokens=500
+                max_tokens=500,
+                cache_text=f"{original_prompt}\n{code}",
+                meta={'language': language, 'task': 'review'},
+                cache=self.cache,
+                response_cache=self.response_cache,
+                # Content tokens drop operators and words like and/or/in, so
+                # "a < b and x" and "a > b or x" would share a semantic key
+                use_semantic_cache=False
             )
             
-            return response.choices[0].message.content.strip()
-            
         except Exception as e:
             return f"Review unavailable: {str(e)}"
     
     def _generate_filename(self, prompt: str, language: str) -> str:
         """Generate a meaningful filename from the prompt."""
-        # Extract key words from prompt
-        words = prompt.lower().split()
-        
-        # Filter common words
-        stop_words = {'a', 'an', 'the', 'to', 'for', 'of', 'in', 'on', 'with', 'write', 'create', 'make', 'code'}
-        meaningful_words = [w for w in words if w not in stop_words and w.isalnum()]
-        
-        # Take first 3-4 meaningful words
-        filename_parts = meaningful_words[:4]
-        
-        if not filename_parts:
-            filename_parts = ['generated_code']
-        
-        filename = '_'.join(filename_parts)
+        # Take the first 3-4 meaningful words of the prompt
+        words = _WORD_RE.findall(prompt.lower())
+        filename_parts = [w for w in words if w not in _STOP_WORDS][:4]
         
         # Truncate if too long
-        if len(filename) > 50:
-            filename = filename[:50]
-        
-        return filename
+        return '_'.join(filename_parts or ['generated_code'])[:50]
+
+
+@lru_cache(maxsize=4)
+def _get_agent(api_key: str, base_dir: str) -> CodeGenerationAgent:
+    """Return an agent reused across convenience calls with the same API key and base directory."""
+    return CodeGenerationAgent(api_key, get_fs_tools(base_dir))
 
 
 # Standalone function for easy integration
@@ -170,6 +300,5 @@ def generate_and_save_code(api_key: str, user_prompt: str, base_dir, language: s
     Returns:
         dict with code, review, and filepath
     """
-    fs_tools = FileSystemTools(base_dir)
-    agent = CodeGenerationAgent(api_key, fs_tools)
+    agent = _get_agent(api_key, str(base_dir))
     return agent.generate_code(user_prompt, language)
@@ -1,19 +1,108 @@
 """
 CSV Analysis Agent with human-in-the-loop suggestions using Groq API.
 """
-from groq import Groq
-from .tools import FileSystemTools
+import asyncio
+from functools import lru_cache
+from .tools import FileSystemTools, get_fs_tools, _file_sha256
+from .logging_utils import get_logger
+from ._llm_cache import cached_completion, get_groq_client, semantic_cache, ResponseCache
 import json
+import re
+import traceback
+from itertools import islice
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib parser
+    orjson = None
+
+
+# Body of a fenced markdown block, with an optional json language tag
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.S)
+
+
+def _json_dumps_indented(obj) -> str:
+    """Serialize to indented JSON, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY).decode()
+    return json.dumps(obj, indent=2, default=str)
+
+
+def _json_loads(text: str):
+    """Parse JSON, using orjson when available."""
+    return orjson.loads(text) if orjson is not None else json.loads(text)
+
 
 class CSVAnalysisAgent:
     """Agent that analyzes CSV files and provides intelligent suggestions."""
     
-    def __init__(self, api_key: str, fs_tools: FileSystemTools):
-        self.client = Groq(api_key=api_key)
+    # Primary routing: suggestion id -> handler method (ids >= 5 generate a report)
+    _ACTION_HANDLERS = {
+        1: '_execute_statistics',
+        2: '_execute_statistics',
+        3: '_execute_quality_check',
+        4: '_execute_filter',
+    }
+    
+    # Fallback routing on substrings of the action title, checked in order
+    # ("filtering" and "statistical" match like "filter" and "statistic")
+    _ACTION_KEYWORDS = (
+        (re.compile('statistic|summary|view|calculate'), '_execute_statistics'),
+        (re.compile('quality|check|validate|missing'), '_execute_quality_check'),
+        (re.compile('filter|export|extract'), '_execute_filter'),
+        (re.compile('report|generate|create'), '_execute_report'),
+    )
+    
+    # Suggestions offered when the LLM summary fails
+    _FALLBACK_SUGGESTIONS = (
+        {'id': 1, 'title': 'View Statistics', 'description': 'Get statistical summary of numeric columns'},
+        {'id': 2, 'title': 'Check Data Quality', 'description': 'Identify missing values and data issues'},
+        {'id': 3, 'title': 'Export Filtered Data', 'description': 'Filter and export specific rows/columns'},
+        {'id': 4, 'title': 'Generate Report', 'description': 'Create a summary report of the data'},
+    )
+    
+    # Prompt for the CSV summary and suggestions, filled in with str.format
+    _PROMPT_TMPL = """You are a data analysis expert. Analyze this CSV file and provide insights.
+
+CSV DETAILS:
+- Rows: {num_rows}
+- Columns: {num_cols}
+- Column Names: {columns_info}
+
+SAMPLE DATA (first 3 rows):
+{sample_data}
+
+Provide:
+1. A brief 1-2 sentence summary describing what this CSV contains (e.g., "employee details", "sales data", "customer information")
+2. Exactly 4-5 specific, actionable suggestions for what the user could do with this data
+
+Format your response as JSON:
+{{
+  "content_summary": "Brief description of the CSV content",
+  "suggestions": [
+    {{"id": 1, "title": "Suggestion title", "description": "Brief description"}},
+    {{"id": 2, "title": "Suggestion title", "description": "Brief description"}},
+    ...
+  ]
+}}
+
+IMPORTANT: Return ONLY valid JSON, no additional text.
+"""
+    
+    # Analysis results are keyed on file contents, so they stay valid across restarts
+    _ANALYSIS_CACHE_TTL = 24 * 3600
+    
+    def __init__(self, api_key: str, fs_tools: FileSystemTools, client=None):
+        self.client = client or get_groq_client(api_key)
         self.fs_tools = fs_tools
         self.model_id = "llama-3.3-70b-versatile"
+        self.fast_model_id = "llama-3.1-8b-instant"  # Used for short structured summaries
+        self.cache = semantic_cache
+        self.response_cache = ResponseCache(fs_tools.base_dir / '.llm_cache.db')
+        self.analysis_cache = ResponseCache(
+            fs_tools.base_dir / '.csv_analysis_cache.db', ttl=self._ANALYSIS_CACHE_TTL
+        )
     
     def analyze_csv(self, csv_path: str) -> dict:
         """
@@ -26,6 +115,14 @@ class CSVAnalysisAgent:
             dict with analysis, content summary, and actionable suggestions
         """
         try:
+            # Reuse a previous analysis of identical file contents
+            cache_key = ResponseCache.make_key(content_hash=_file_sha256(csv_path), model=self.fast_model_id)
+            cached = self.analysis_cache.get(cache_key)
+            if cached is not None:
+                result = json.loads(cached)
+                result['filename'] = Path(csv_path).name
+                return result
+            
             # Get CSV structure analysis
             analysis = self.fs_tools.analyze_csv_structure(csv_path)
             
@@ -34,76 +131,74 @@ class CSVAnalysisAgent:
             
             # Generate content summary and suggestions using Groq
             summary_and_suggestions = self._generate_summary_and_suggestions(analysis)
+            suggestions = summary_and_suggestions['suggestions']
             
-            return {
+            result = {
                 'status': 'success',
                 'filename': Path(csv_path).name,
                 'num_rows': analysis['num_rows'],
                 'num_cols': analysis['num_cols'],
                 'columns': analysis['columns'],
                 'content_summary': summary_and_suggestions['content_summary'],
-                'suggestions': summary_and_suggestions['suggestions'],
+                'suggestions': suggestions,
+                # String keys so the map survives the JSON round-trip through the client
+                '_id_to_title': {str(s.get('id')): s.get('title', 'Unknown Action') for s in suggestions},
                 'sample_data': analysis['sample_data'][:3],  # Show first 3 rows
                 'message': 'CSV analyzed successfully'
             }
             
+            # Don't persist the generic suggestions used when the LLM call failed
+            if suggestions is not self._FALLBACK_SUGGESTIONS:
+                self.analysis_cache.set(cache_key, json.dumps(result, default=str))
+            
+            return result
+            
         except Exception as e:
             return {
                 'status': 'error',
                 'message': f'Error analyzing CSV: {str(e)}'
             }
     
+    async def aanalyze_csv(self, csv_path: str) -> dict:
+        """
+        Async variant of analyze_csv for use from async views.
+        
+        Runs the blocking pandas and Groq calls in a worker thread so the
+        event loop can serve other requests meanwhile.
+        """
+        return await asyncio.to_thread(self.analyze_csv, csv_path)
+    
     def _generate_summary_and_suggestions(self, analysis: dict) -> dict:
         """Generate intelligent summary and suggestions using Groq."""
         try:
             # Prepare analysis data for Groq
             columns_info = ', '.join(analysis['columns'])
-            sample_data = json.dumps(analysis['sample_data'][:3], indent=2)
+            sample_data = _json_dumps_indented(analysis['sample_data'][:3])
             
-            prompt = f"""You are a data analysis expert. Analyze this CSV file and provide insights.
-
-CSV DETAILS:
-- Rows: {analysis['num_rows']}
-- Columns: {analysis['num_cols']}
-- Column Names: {columns_info}
-
-SAMPLE DATA (first 3 rows):
-{sample_data}
-
-Provide:
-1. A brief 1-2 sentence summary describing what this CSV contains (e.g., "employee details", "sales data", "customer information")
-2. Exactly 4-5 specific, actionable suggestions for what the user could do with this data
-
-Format your response as JSON:
-{{
-  "content_summary": "Brief description of the CSV content",
-  "suggestions": [
-    {{"id": 1, "title": "Suggestion title", "description": "Brief description"}},
-    {{"id": 2, "title": "Suggestion title", "description": "Brief description"}},
-    ...
-  ]
-}}
-
-IMPORTANT: Return ONLY valid JSON, no additional text.
-"""
+            prompt = self._PROMPT_TMPL.format(
+                num_rows=analysis['num_rows'],
+                num_cols=analysis['num_cols'],
+                columns_info=columns_info,
+                sample_data=sample_data
+            )
             
-            response = self.client.chat.completions.create(
-                model=self.model_id,
-                messages=[{"role": "user", "content": prompt}],
+            response_text = cached_completion(
+                self.client,
+                prompt,
+                model=self.fast_model_id,
                 temperature=0.7,
-                max_tokens=800
+                max_tokens=800,
+                cache_text=f"{columns_info}\n{sample_data}",
+                meta={'task': 'csv_summary'},
+                cache=self.cache,
+                response_cache=self.response_cache,
+                response_format={"type": "json_object"}
             )
             
-            # Parse JSON response
-            response_text = response.choices[0].message.content.strip()
-            
-            # Extract JSON from response (in case it has markdown code blocks)
-            if '```json' in response_text:
-                response_text = response_text.split('```json')[1].split('```')[0].strip()
-            elif '```' in response_text:
-                response_text = response_text.split('```')[1].split('```')[0].strip()
-            
-            result = json.loads(response_text)
+            # Extract the JSON object from the response (in case it has markdown code blocks)
+            match = _JSON_FENCE_RE.search(response_text)
+            payload = match.group(1) if match else response_text
+            result = _json_loads(payload[payload.find('{'):payload.rfind('}') + 1])
             
             return result
             
@@ -111,28 +206,7 @@ IMPORTANT: Return ONLY valid JSON, no additional text.
             # Fallback suggestions if AI fails
             return {
                 'content_summary': f"A CSV file with {analysis['num_cols']} columns and {analysis['num_rows']} rows",
-                'suggestions': [
-                    {
-                        'id': 1,
-                        'title': 'View Statistics',
-                        'description': 'Get statistical summary of numeric columns'
-                    },
-                    {
-                        'id': 2,
-                        'title': 'Check Data Quality',
-                        'description': 'Identify missing values and data issues'
-                    },
-                    {
-                        'id': 3,
-                        'title': 'Export Filtered Data',
-                        'description': 'Filter and export specific rows/columns'
-                    },
-                    {
-                        'id': 4,
-                        'title': 'Generate Report',
-                        'description': 'Create a summary report of the data'
-                    }
-                ]
+                'suggestions': self._FALLBACK_SUGGESTIONS
             }
     
     def execute_action(self, csv_path: str, action_id: int, analysis: dict) -> dict:
@@ -147,56 +221,37 @@ IMPORTANT: Return ONLY valid JSON, no additional text.
         Returns:
             dict with action result
         """
-        from pathlib import Path
-        from .logging_utils import get_logger
-        
         try:
             # Initialize logger with correct base directory
             logger = get_logger(self.fs_tools.base_dir)
             
-            # Get action name from suggestions
-            action_name = "Unknown Action"
-            suggestions = analysis.get('suggestions', [])
-            for suggestion in suggestions:
-                if suggestion.get('id') == action_id:
-                    action_name = suggestion.get('title', 'Unknown Action')
-                    break
+            # Get action name from the id -> title map built by analyze_csv
+            id_to_title = analysis.get('_id_to_title')
+            if id_to_title is not None:
+                action_name = id_to_title.get(str(action_id), 'Unknown Action')
+            else:
+                suggestions = analysis.get('suggestions') or ()
+                action_name = next(
+                    (s.get('title', 'Unknown Action') for s in suggestions if s.get('id') == action_id),
+                    'Unknown Action'
+                )
             
             # Log action start
             logger.log_action_start(action_id, action_name, csv_path)
             
-            # Route to appropriate handler based on action_id AND action_name keywords
-            result = None
-            
-            # Try to match by action name keywords first
-            action_lower = action_name.lower()
-            
-            # Primary routing based on action_id with keyword fallback
-            if action_id == 1 or action_id == 2:
-                # Action 1-2: Usually statistics/summary
-                result = self._execute_statistics(csv_path, logger)
-            elif action_id == 3:
-                # Action 3: Usually data quality check
-                result = self._execute_quality_check(csv_path, logger)
-            elif action_id == 4:
-                # Action 4: Usually filtering/export
-                result = self._execute_filter(csv_path, logger)
-            elif action_id >= 5:
-                # Action 5+: Usually report generation
-                result = self._execute_report(csv_path, logger)
-            else:
-                # Fallback to keyword matching
-                if 'statistic' in action_lower or 'summary' in action_lower or 'view' in action_lower or 'calculate' in action_lower:
-                    result = self._execute_statistics(csv_path, logger)
-                elif 'quality' in action_lower or 'check' in action_lower or 'validate' in action_lower or 'missing' in action_lower:
-                    result = self._execute_quality_check(csv_path, logger)
-                elif 'filter' in action_lower or 'export' in action_lower or 'extract' in action_lower:
-                    result = self._execute_filter(csv_path, logger)
-                elif 'report' in action_lower or 'generate' in action_lower or 'create' in action_lower:
-                    result = self._execute_report(csv_path, logger)
+            # Route to appropriate handler based on action_id with keyword fallback
+            handler_name = self._ACTION_HANDLERS.get(action_id)
+            if handler_name is None:
+                if isinstance(action_id, int) and action_id >= 5:
+                    handler_name = '_execute_report'
                 else:
-                    # Default to statistics if no match
-                    result = self._execute_statistics(csv_path, logger)
+                    action_lower = action_name.lower()
+                    handler_name = next(
+                        (name for keywords, name in self._ACTION_KEYWORDS if keywords.search(action_lower)),
+                        '_execute_statistics'  # Default to statistics if no match
+                    )
+            
+            result = getattr(self, handler_name)(csv_path, logger)
             
             # Log result
             logger.log_action_result(action_id, result.get('status', 'unknown'), result)
@@ -214,7 +269,6 @@ IMPORTANT: Return ONLY valid JSON, no additional text.
             except:
                 pass
             
-            import traceback
             return {
                 'status': 'error',
                 'message': f'Error executing action: {str(e)}',
@@ -292,16 +346,17 @@ IMPORTANT: Return ONLY valid JSON, no additional text.
             
             # For now, provide information about the data structure
             # In a full implementation, this would accept filter criteria
-            import pandas as pd
-            from pathlib import Path
-            
-            df = pd.read_csv(csv_path)
+            # The row count comes from the cached profile, so the file is not parsed again
+            profile = self.fs_tools.profile_csv(csv_path)
+            if profile['status'] != 'success':
+                return profile
+            num_rows = profile['structure']['num_rows']
             
             # Example: Export first 10 rows as a sample
             csv_name = Path(csv_path).stem
             filtered_path = self.fs_tools.base_dir / 'reports' / f'{csv_name}_sample_10.csv'
             
-            df.head(10).to_csv(filtered_path, index=False)
+            self.fs_tools.head_csv(csv_path, 10).to_csv(filtered_path, index=False)
             logger.log_info(f"Exported sample to: {filtered_path}")
             
             summary = f"""Data filtering prepared. 
@@ -309,7 +364,7 @@ IMPORTANT: Return ONLY valid JSON, no additional text.
 **Sample Export:**
 - Exported first 10 rows to demonstrate filtering
 - File: `{filtered_path.name}`
-- Total rows in original: {len(df)}
+- Total rows in original: {num_rows}
 
 **Note:** Full filtering with custom criteria can be implemented based on your requirements."""
             
@@ -333,22 +388,8 @@ IMPORTANT: Return ONLY valid JSON, no additional text.
         try:
             logger.log_info("Generating comprehensive report...")
             
-            # Calculate statistics
-            stats_result = self.fs_tools.calculate_detailed_statistics(csv_path)
-            if stats_result['status'] != 'success':
-                return stats_result
-            
-            # Check quality
-            quality_result = self.fs_tools.check_data_quality(csv_path)
-            if quality_result['status'] != 'success':
-                return quality_result
-            
-            # Generate HTML report
-            report_result = self.fs_tools.generate_csv_report(
-                csv_path,
-                stats_result['statistics'],
-                quality_result['quality_report']
-            )
+            # Generate HTML report from the (cached) profile of the file
+            report_result = self.fs_tools.generate_csv_report(csv_path)
             
             if report_result['status'] != 'success':
                 return report_result
@@ -393,18 +434,20 @@ You can open the HTML report in your web browser to view the full analysis."""
         numeric = stats.get('numeric_columns', {})
         if numeric:
             summary_lines.append("**Numeric Columns:**")
-            for col, col_stats in list(numeric.items())[:5]:  # Show first 5
-                summary_lines.append(
-                    f"- **{col}**: Mean={col_stats['mean']:.2f}, "
-                    f"Min={col_stats['min']:.2f}, Max={col_stats['max']:.2f}"
-                )
+            summary_lines.extend(
+                f"- **{col}**: Mean={col_stats['mean']:.2f}, "
+                f"Min={col_stats['min']:.2f}, Max={col_stats['max']:.2f}"
+                for col, col_stats in islice(numeric.items(), 5)  # Show first 5
+            )
         
         # Categorical columns
         categorical = stats.get('categorical_columns', {})
         if categorical:
             summary_lines.append("\n**Categorical Columns:**")
-            for col, col_stats in list(categorical.items())[:5]:  # Show first 5
-                summary_lines.append(f"- **{col}**: {col_stats['unique']} unique values")
+            summary_lines.extend(
+                f"- **{col}**: {col_stats['unique']} unique values"
+                for col, col_stats in islice(categorical.items(), 5)  # Show first 5
+            )
         
         return '\n'.join(summary_lines)
     
@@ -416,8 +459,10 @@ You can open the HTML report in your web browser to view the full analysis."""
         missing = quality.get('missing_values', {})
         if missing:
             summary_lines.append("**⚠ Missing Values:**")
-            for col, info in list(missing.items())[:5]:
-                summary_lines.append(f"- **{col}**: {info['count']} missing ({info['percentage']:.2f}%)")
+            summary_lines.extend(
+                f"- **{col}**: {info['count']} missing ({info['percentage']:.2f}%)"
+                for col, info in islice(missing.items(), 5)
+            )
         else:
             summary_lines.append("✓ No missing values detected")
         
@@ -433,14 +478,22 @@ You can open the HTML report in your web browser to view the full analysis."""
         outliers = quality.get('outliers', {})
         if outliers:
             summary_lines.append("\n**ℹ Outliers Detected:**")
-            for col, info in list(outliers.items())[:5]:
-                summary_lines.append(f"- **{col}**: {info['count']} outliers ({info['percentage']:.2f}%)")
+            summary_lines.extend(
+                f"- **{col}**: {info['count']} outliers ({info['percentage']:.2f}%)"
+                for col, info in islice(outliers.items(), 5)
+            )
         else:
             summary_lines.append("\n✓ No significant outliers detected")
         
         return '\n'.join(summary_lines)
 
 
+@lru_cache(maxsize=4)
+def _get_agent(api_key: str, base_dir: str) -> CSVAnalysisAgent:
+    """Return an agent reused across convenience calls with the same API key and base directory."""
+    return CSVAnalysisAgent(api_key, get_fs_tools(base_dir))
+
+
 # Standalone function for easy integration
 def analyze_csv_file(api_key: str, csv_path: str, base_dir) -> dict:
     """
@@ -454,6 +507,5 @@ def analyze_csv_file(api_key: str, csv_path: str, base_dir) -> dict:
     Returns:
         dict with analysis and suggestions
     """
-    fs_tools = FileSystemTools(base_dir)
-    agent = CSVAnalysisAgent(api_key, fs_tools)
+    agent = _get_agent(api_key, str(base_dir))
     return agent.analyze_csv(csv_path)
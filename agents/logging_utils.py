@@ -4,12 +4,23 @@ Provides dual logging to both file and console/terminal.
 """
 import logging
 import sys
+import threading
+from logging.handlers import MemoryHandler, TimedRotatingFileHandler
 from pathlib import Path
-from datetime import datetime
 from typing import Optional, Dict, Any
 import json
 
 
+_RULE = "=" * 80
+
+
+def _dated_log_name(default_name: str) -> str:
+    """Name rotated log files csv_actions_YYYY-MM-DD.log instead of csv_actions.log.YYYY-MM-DD."""
+    path = Path(default_name)
+    base_name, _, date_suffix = path.name.rpartition('.')
+    return str(path.with_name(f"{Path(base_name).stem}_{date_suffix}.log"))
+
+
 class CSVActionLogger:
     """Logger for CSV action executions with dual output (file + console)."""
     
@@ -28,18 +39,21 @@ class CSVActionLogger:
         self.logger = logging.getLogger('csv_actions')
         self.logger.setLevel(logging.INFO)
         
-        # File handler - daily log file
-        log_filename = f"csv_actions_{datetime.now().strftime('%Y-%m-%d')}.log"
-        log_filepath = self.logs_dir / log_filename
+        # File handler - rolls over to a new file at midnight
+        log_filepath = self.logs_dir / 'csv_actions.log'
         
         # Store log file path
         self.current_log_file = str(log_filepath)
         
         # Prevent duplicate logs if logger already configured
         if self.logger.handlers:
+            self.buffer_handler = next(
+                (h for h in self.logger.handlers if isinstance(h, MemoryHandler)), None
+            )
             return
         
-        file_handler = logging.FileHandler(log_filepath, encoding='utf-8')
+        file_handler = TimedRotatingFileHandler(log_filepath, when='midnight', encoding='utf-8')
+        file_handler.namer = _dated_log_name
         file_handler.setLevel(logging.INFO)
         
         # Console handler - output to terminal
@@ -55,8 +69,11 @@ class CSVActionLogger:
         file_handler.setFormatter(formatter)
         console_handler.setFormatter(formatter)
         
+        # Buffer file writes; flushed after each action and immediately on errors
+        self.buffer_handler = MemoryHandler(capacity=256, flushLevel=logging.ERROR, target=file_handler)
+        
         # Add handlers
-        self.logger.addHandler(file_handler)
+        self.logger.addHandler(self.buffer_handler)
         self.logger.addHandler(console_handler)
     
     def log_action_start(self, action_id: int, action_name: str, csv_file: str):
@@ -68,12 +85,11 @@ class CSVActionLogger:
             action_name: Name/description of the action
             csv_file: Path to the CSV file being processed
         """
-        self.logger.info("="*80)
-        self.logger.info(f"Starting CSV Action Execution")
-        self.logger.info(f"Action ID: {action_id}")
-        self.logger.info(f"Action: {action_name}")
-        self.logger.info(f"CSV File: {csv_file}")
-        self.logger.info("="*80)
+        # One record instead of one per line
+        self.logger.info(
+            "%s\nStarting CSV Action Execution\nAction ID: %s\nAction: %s\nCSV File: %s\n%s",
+            _RULE, action_id, action_name, csv_file, _RULE
+        )
     
     def log_action_result(self, action_id: int, status: str, result: Dict[str, Any]):
         """
@@ -84,19 +100,23 @@ class CSVActionLogger:
             status: Status of execution ('success' or 'error')
             result: Result dictionary from action execution
         """
-        self.logger.info(f"Action {action_id} completed with status: {status}")
+        lines = [f"Action {action_id} completed with status: {status}"]
+        level = logging.INFO
         
         if status == 'success':
             # Log key result metrics
             if 'output' in result:
-                self.logger.info(f"Output summary: {result.get('summary', 'N/A')}")
+                lines.append(f"Output summary: {result.get('summary', 'N/A')}")
             
             if 'files_created' in result:
-                self.logger.info(f"Files created: {', '.join(result['files_created'])}")
+                lines.append(f"Files created: {', '.join(result['files_created'])}")
         else:
-            self.logger.error(f"Error message: {result.get('message', 'Unknown error')}")
+            lines.append(f"Error message: {result.get('message', 'Unknown error')}")
+            level = logging.ERROR
         
-        self.logger.info("-"*80)
+        lines.append("-"*80)
+        self.logger.log(level, '\n'.join(lines))
+        self.flush()
     
     def log_statistics(self, stats: Dict[str, Any]):
         """
@@ -106,7 +126,7 @@ class CSVActionLogger:
             stats: Statistics dictionary
         """
         self.logger.info("Statistics Calculation Results:")
-        self.logger.info(json.dumps(stats, indent=2, default=str))
+        self.logger.info(json.dumps(stats, separators=(',', ':'), default=str))
     
     def log_quality_check(self, quality_report: Dict[str, Any]):
         """
@@ -116,7 +136,7 @@ class CSVActionLogger:
             quality_report: Quality check results
         """
         self.logger.info("Data Quality Check Results:")
-        self.logger.info(json.dumps(quality_report, indent=2, default=str))
+        self.logger.info(json.dumps(quality_report, separators=(',', ':'), default=str))
     
     def log_error(self, action_id: int, error_message: str, exception: Optional[Exception] = None):
         """
@@ -131,6 +151,11 @@ class CSVActionLogger:
         if exception:
             self.logger.error(f"Exception details: {str(exception)}", exc_info=True)
     
+    def flush(self):
+        """Write buffered log records to the log file."""
+        if self.buffer_handler is not None:
+            self.buffer_handler.flush()
+    
     def get_log_file_path(self) -> str:
         """
         Get the path to the current log file.
@@ -149,14 +174,27 @@ class CSVActionLogger:
         self.logger.warning(message)
 
 
+_LOGGER_CACHE: Dict[Path, CSVActionLogger] = {}
+_LOGGER_CACHE_LOCK = threading.Lock()
+
+
 def get_logger(base_dir: Path) -> CSVActionLogger:
     """
     Get or create a CSV action logger instance.
     
+    Instances are cached per resolved base directory.
+    
     Args:
         base_dir: Base directory of the project
     
     Returns:
         CSVActionLogger instance
     """
-    return CSVActionLogger(base_dir)
+    key = Path(base_dir).resolve()
+    instance = _LOGGER_CACHE.get(key)
+    if instance is None:
+        with _LOGGER_CACHE_LOCK:
+            instance = _LOGGER_CACHE.get(key)
+            if instance is None:
+                instance = _LOGGER_CACHE[key] = CSVActionLogger(key)
+    return instance
@@ -1,18 +1,36 @@
 """
 PDF Extraction Agent using Groq API.
 """
-from groq import Groq
-from .tools import FileSystemTools
+from functools import lru_cache
+from .tools import FileSystemTools, get_fs_tools
+from ._llm_cache import cached_completion, get_groq_client, ResponseCache
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
+import re
+
+
+_WORD_RE = re.compile(r"\S+")
+
+# Worker threads for filesystem writes that overlap with Groq requests
+_IO_POOL = ThreadPoolExecutor(max_workers=4)
 
 
 class PDFExtractionAgent:
     """Agent that extracts text from PDF files and saves to raw_text folder."""
     
-    def __init__(self, api_key: str, fs_tools: FileSystemTools):
-        self.client = Groq(api_key=api_key)
+    # Prompt for the document summary, filled in with str.format
+    _SUMMARY_TMPL = """Provide a brief 2-3 sentence summary of this document content:
+
+{text_sample}
+
+Focus on the main topic and purpose of the document."""
+    
+    def __init__(self, api_key: str, fs_tools: FileSystemTools, client=None):
+        self.client = client or get_groq_client(api_key)
         self.fs_tools = fs_tools
         self.model_id = "llama-3.3-70b-versatile"
+        self.response_cache = ResponseCache(fs_tools.base_dir / '.llm_cache.db')
     
     def process_pdf(self, pdf_path: str) -> dict:
         """
@@ -36,12 +54,11 @@ class PDFExtractionAgent:
             page_count = extraction_result['page_count']
             word_count = extraction_result['word_count']
             
-            # Save to raw_text folder
+            # Save to raw_text folder in the background while Groq generates the summary
             original_filename = Path(pdf_path).name
-            save_result = self.fs_tools.save_text_to_file(text, original_filename)
-            
-            # Generate a summary using Groq
+            save_future = _IO_POOL.submit(self.fs_tools.save_text_to_file, text, original_filename)
             summary = self._generate_summary(text, page_count, word_count)
+            save_result = save_future.result()
             
             return {
                 'status': 'success',
@@ -62,29 +79,34 @@ class PDFExtractionAgent:
     def _generate_summary(self, text: str, page_count: int, word_count: int) -> str:
         """Generate a brief summary of the extracted content using Groq."""
         try:
-            # For very long texts, only analyze first ~2000 words
-            text_sample = ' '.join(text.split()[:2000])
+            # For very long texts, only analyze first ~2000 words (stops scanning after them)
+            text_sample = ' '.join(m.group() for m in islice(_WORD_RE.finditer(text), 2000))
             
-            summary_prompt = f"""Provide a brief 2-3 sentence summary of this document content:
-
-{text_sample}
-
-Focus on the main topic and purpose of the document."""
+            summary_prompt = self._SUMMARY_TMPL.format(text_sample=text_sample)
             
-            response = self.client.chat.completions.create(
+            # Only an exact prompt match is reused; similar documents need their own summary
+            summary = cached_completion(
+                self.client,
+                summary_prompt,
                 model=self.model_id,
-                messages=[{"role": "user", "content": summary_prompt}],
                 temperature=0.5,
-                max_tokens=200
+                max_tokens=200,
+                meta={'task': 'pdf_summary'},
+                response_cache=self.response_cache,
+                use_semantic_cache=False
             )
-            
-            summary = response.choices[0].message.content.strip()
             return f"Document Summary ({page_count} pages, {word_count} words): {summary}"
             
         except Exception:
             return f"Extracted {word_count} words from {page_count} pages."
 
 
+@lru_cache(maxsize=4)
+def _get_agent(api_key: str, base_dir: str) -> PDFExtractionAgent:
+    """Return an agent reused across convenience calls with the same API key and base directory."""
+    return PDFExtractionAgent(api_key, get_fs_tools(base_dir))
+
+
 # Standalone function for easy integration
 def extract_pdf_text(api_key: str, pdf_path: str, base_dir) -> dict:
     """
@@ -98,6 +120,5 @@ def extract_pdf_text(api_key: str, pdf_path: str, base_dir) -> dict:
     Returns:
         dict with extracted text, stats, and filepath
     """
-    fs_tools = FileSystemTools(base_dir)
-    agent = PDFExtractionAgent(api_key, fs_tools)
+    agent = _get_agent(api_key, str(base_dir))
     return agent.process_pdf(pdf_path)
@@ -1,13 +1,59 @@
 """
 Router Agent - Main orchestrator using Groq API.
 """
-from groq import Groq
 from .code_gen_agent import CodeGenerationAgent
 from .pdf_agent import PDFExtractionAgent
 from .csv_agent import CSVAnalysisAgent
-from .tools import FileSystemTools
+from .tools import get_fs_tools
+from ._llm_cache import get_groq_client
+from functools import lru_cache
 from pathlib import Path
+from typing import Dict, Iterator, Tuple
 import json
+import re
+import threading
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib parser
+    orjson = None
+
+
+# Body of a fenced markdown block, with an optional json language tag
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.S)
+
+# Local intent prefilter: a message naming an action and a code artifact is
+# classified as code generation without a Groq call if it also names one
+# language from _LANG_HINTS or uses an artifact word that only means code.
+# Messages naming a language outside _LANG_HINTS, or several languages, and
+# ambiguous ones such as "create a class schedule" are left to Groq.
+_INTENT_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+_INTENT_VERBS = frozenset({'write', 'create', 'generate', 'implement', 'build'})
+_INTENT_ARTIFACTS = frozenset({'code', 'function', 'class', 'script', 'program', 'method', 'algorithm', 'def'})
+_CODE_ONLY_ARTIFACTS = frozenset({'code', 'function', 'def', 'algorithm'})
+_LANG_HINTS = {
+    'python': 'python',
+    'javascript': 'javascript',
+    'js': 'javascript',
+    'typescript': 'typescript',
+    'java': 'java',
+    'c++': 'cpp',
+    'cpp': 'cpp',
+    'rust': 'rust',
+}
+# Languages the prefilter cannot name; messages mentioning one are left to Groq
+_OTHER_LANGUAGES = frozenset({
+    'c', 'c#', 'csharp', 'go', 'golang', 'bash', 'shell', 'sh', 'zsh', 'powershell',
+    'html', 'css', 'sql', 'ruby', 'php', 'kotlin', 'swift', 'scala', 'perl', 'r',
+    'lua', 'haskell', 'dart', 'matlab', 'julia', 'elixir', 'erlang', 'clojure',
+    'fortran', 'cobol', 'assembly', 'asm', 'vb', 'vba', 'groovy', 'ocaml', 'f#',
+    'zig', 'solidity', 'objective',
+})
+
+
+def _json_loads(text: str):
+    """Parse JSON, using orjson when available."""
+    return orjson.loads(text) if orjson is not None else json.loads(text)
 
 
 class RouterAgent:
@@ -15,17 +61,73 @@ class RouterAgent:
     Main orchestrator agent that analyzes user intent and routes to specialized agents.
     """
     
+    # Prompt for intent classification, filled in with str.format
+    _INTENT_TMPL = """Analyze this user message and determine the intent.
+
+USER MESSAGE: "{message}"
+
+Determine if the user is:
+1. Requesting code generation (keywords: write, create, generate, code, function, class, script, program, etc.)
+2. General chat/question
+
+Also detect programming language if code generation is requested (python, javascript, java, etc.)
+
+Respond in JSON format:
+{{
+  "type": "code_generation" or "general_chat",
+  "language": "python" (only if code_generation, otherwise omit),
+  "confidence": 0.0 to 1.0
+}}
+
+Return ONLY valid JSON, no additional text.
+"""
+    
+    # Upload handlers by file type / extension
+    _FILE_HANDLERS = {
+        'pdf': '_handle_pdf_upload',
+        'csv': '_handle_csv_upload',
+    }
+    
+    # System prompt for general chat
+    _CHAT_SYSTEM_MESSAGE = """You are a helpful AI assistant in a chatbot that can:
+1. Generate code when requested (just ask me to write any code!)
+2. Extract text from PDF files when uploaded
+3. Analyze CSV files and provide intelligent suggestions when uploaded
+
+For general questions, provide helpful and concise responses."""
+    
     def __init__(self, api_key: str, base_dir: Path):
-        self.client = Groq(api_key=api_key)
+        self.client = get_groq_client(api_key)
         self.api_key = api_key
         self.base_dir = base_dir
         self.model_id = "llama-3.3-70b-versatile"
         
-        # Initialize tools and specialized agents
-        self.fs_tools = FileSystemTools(base_dir)
-        self.code_gen_agent = CodeGenerationAgent(api_key, self.fs_tools)
-        self.pdf_agent = PDFExtractionAgent(api_key, self.fs_tools)
-        self.csv_agent = CSVAnalysisAgent(api_key, self.fs_tools)
+        # Initialize tools; specialized agents are created on first use
+        self.fs_tools = get_fs_tools(base_dir)
+        self._code_gen_agent = None
+        self._pdf_agent = None
+        self._csv_agent = None
+        
+        # Groq intent classifications, reused for repeated messages
+        self._classify_intent_cached = lru_cache(maxsize=1024)(self._classify_intent)
+    
+    @property
+    def code_gen_agent(self) -> CodeGenerationAgent:
+        if self._code_gen_agent is None:
+            self._code_gen_agent = CodeGenerationAgent(self.api_key, self.fs_tools, client=self.client)
+        return self._code_gen_agent
+    
+    @property
+    def pdf_agent(self) -> PDFExtractionAgent:
+        if self._pdf_agent is None:
+            self._pdf_agent = PDFExtractionAgent(self.api_key, self.fs_tools, client=self.client)
+        return self._pdf_agent
+    
+    @property
+    def csv_agent(self) -> CSVAnalysisAgent:
+        if self._csv_agent is None:
+            self._csv_agent = CSVAnalysisAgent(self.api_key, self.fs_tools, client=self.client)
+        return self._csv_agent
     
     def process_message(self, message: str, uploaded_file: dict = None) -> dict:
         """
@@ -57,27 +159,32 @@ class RouterAgent:
         file_path = uploaded_file['path']
         file_type = uploaded_file['type']
         
-        if file_type == 'pdf' or file_path.lower().endswith('.pdf'):
-            # Route to PDF agent
-            result = self.pdf_agent.process_pdf(file_path)
-            result['mode'] = 'pdf_extraction'
-            result['user_message'] = message
-            return result
-            
-        elif file_type == 'csv' or file_path.lower().endswith('.csv'):
-            # Route to CSV agent
-            result = self.csv_agent.analyze_csv(file_path)
-            result['mode'] = 'csv_analysis'
-            result['user_message'] = message
-            result['file_path'] = file_path  # Store for later action execution
-            return result
-            
-        else:
+        # Dispatch on the declared type, falling back to the file extension
+        kind = file_type if file_type in self._FILE_HANDLERS else Path(file_path).suffix.lower().lstrip('.')
+        handler_name = self._FILE_HANDLERS.get(kind)
+        if handler_name is None:
             return {
                 'status': 'error',
                 'message': f'Unsupported file type: {file_type}. Please upload PDF or CSV files.',
                 'mode': 'error'
             }
+        
+        return getattr(self, handler_name)(message, file_path)
+    
+    def _handle_pdf_upload(self, message: str, file_path: str) -> dict:
+        """Route an uploaded PDF to the PDF agent."""
+        result = self.pdf_agent.process_pdf(file_path)
+        result['mode'] = 'pdf_extraction'
+        result['user_message'] = message
+        return result
+    
+    def _handle_csv_upload(self, message: str, file_path: str) -> dict:
+        """Route an uploaded CSV to the CSV agent."""
+        result = self.csv_agent.analyze_csv(file_path)
+        result['mode'] = 'csv_analysis'
+        result['user_message'] = message
+        result['file_path'] = file_path  # Store for later action execution
+        return result
     
     def _handle_text_message(self, message: str) -> dict:
         """Handle text-only messages."""
@@ -108,84 +215,57 @@ class RouterAgent:
     
     def _detect_intent(self, message: str) -> dict:
         """
-        Detect user intent from message using Groq.
+        Detect user intent from message, using Groq for messages the keyword
+        prefilter cannot classify.
         
         Returns:
             dict with 'type' and optional 'language'
         """
+        words = set(_INTENT_TOKEN_RE.findall(message.lower()))
+        if words & _INTENT_VERBS and words & _INTENT_ARTIFACTS and not words & _OTHER_LANGUAGES:
+            languages = {lang for hint, lang in _LANG_HINTS.items() if hint in words}
+            if len(languages) == 1:
+                return {'type': 'code_generation', 'language': languages.pop(), 'confidence': 1.0}
+            if not languages and words & _CODE_ONLY_ARTIFACTS:
+                return {'type': 'code_generation', 'language': 'python', 'confidence': 1.0}
+        
         try:
-            prompt = f"""Analyze this user message and determine the intent.
-
-USER MESSAGE: "{message}"
-
-Determine if the user is:
-1. Requesting code generation (keywords: write, create, generate, code, function, class, script, program, etc.)
-2. General chat/question
-
-Also detect programming language if code generation is requested (python, javascript, java, etc.)
-
-Respond in JSON format:
-{{
-  "type": "code_generation" or "general_chat",
-  "language": "python" (only if code_generation, otherwise omit),
-  "confidence": 0.0 to 1.0
-}}
-
-Return ONLY valid JSON, no additional text.
-"""
-            
-            response = self.client.chat.completions.create(
-                model=self.model_id,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.3,
-                max_tokens=150
-            )
-            
-            # Parse JSON response
-            response_text = response.choices[0].message.content.strip()
-            
-            # Extract JSON from response
-            if '```json' in response_text:
-                response_text = response_text.split('```json')[1].split('```')[0].strip()
-            elif '```' in response_text:
-                response_text = response_text.split('```')[1].split('```')[0].strip()
-            
-            intent = json.loads(response_text)
-            
-            # If confidence is low, default to general chat
-            if intent.get('confidence', 0) < 0.6:
-                intent['type'] = 'general_chat'
-            
-            return intent
-            
+            return dict(self._classify_intent_cached(message))
         except Exception:
             # Default to general chat on error
             return {'type': 'general_chat'}
     
+    def _classify_intent(self, message: str) -> dict:
+        """Classify the intent of a message with Groq. Raises on request or parse errors."""
+        prompt = self._INTENT_TMPL.format(message=message)
+        
+        response = self.client.chat.completions.create(
+            model=self.model_id,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.3,
+            max_tokens=150
+        )
+        
+        # Parse JSON response
+        response_text = response.choices[0].message.content.strip()
+        
+        # Extract the JSON object from the response
+        match = _JSON_FENCE_RE.search(response_text)
+        payload = match.group(1) if match else response_text
+        intent = _json_loads(payload[payload.find('{'):payload.rfind('}') + 1])
+        
+        # If confidence is low, default to general chat
+        if intent.get('confidence', 0) < 0.6:
+            intent['type'] = 'general_chat'
+        
+        return intent
+    
     def _handle_general_chat(self, message: str) -> dict:
         """Handle general chat messages using Groq."""
         try:
-            # Create context-aware response
-            system_message = """You are a helpful AI assistant in a chatbot that can:
-1. Generate code when requested (just ask me to write any code!)
-2. Extract text from PDF files when uploaded
-3. Analyze CSV files and provide intelligent suggestions when uploaded
-
-For general questions, provide helpful and concise responses."""
-            
-            response = self.client.chat.completions.create(
-                model=self.model_id,
-                messages=[
-                    {"role": "system", "content": system_message},
-                    {"role": "user", "content": message}
-                ],
-                temperature=0.7,
-                max_tokens=500
-            )
-            
             return {
                 'status': 'success',
-                'message': response.choices[0].message.content.strip(),
+                'message': ''.join(self.stream_chat(message)).strip(),
                 'user_message': message
             }
             
@@ -195,6 +275,31 @@ For general questions, provide helpful and concise responses."""
                 'message': f'Error processing message: {str(e)}'
             }
     
+    def stream_chat(self, message: str) -> Iterator[str]:
+        """
+        Stream a general chat reply from Groq.
+        
+        Args:
+            message: User's message
+        
+        Yields:
+            Reply text fragments as they arrive
+        """
+        response = self.client.chat.completions.create(
+            model=self.model_id,
+            messages=[
+                {"role": "system", "content": self._CHAT_SYSTEM_MESSAGE},
+                {"role": "user", "content": message}
+            ],
+            temperature=0.7,
+            max_tokens=500,
+            stream=True
+        )
+        
+        for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
     def execute_csv_action(self, csv_path: str, action_id: int, analysis: dict) -> dict:
         """
         Execute a CSV action selected by the user.
@@ -219,6 +324,23 @@ For general questions, provide helpful and concise responses."""
             }
 
 
+# Routers reused across calls, keyed on (api_key, base_dir)
+_ROUTER_POOL: Dict[Tuple[str, str], RouterAgent] = {}
+_POOL_LOCK = threading.Lock()
+
+
+def _get_router(api_key: str, base_dir: Path) -> RouterAgent:
+    """Return the pooled router for an API key and base directory, creating it once."""
+    key = (api_key, str(base_dir))
+    router = _ROUTER_POOL.get(key)
+    if router is None:
+        with _POOL_LOCK:
+            router = _ROUTER_POOL.get(key)
+            if router is None:
+                router = _ROUTER_POOL[key] = RouterAgent(api_key, Path(base_dir))
+    return router
+
+
 # Standalone function for easy integration with Django
 def process_chat_message(api_key: str, message: str, base_dir: Path, uploaded_file: dict = None) -> dict:
     """
@@ -233,5 +355,5 @@ def process_chat_message(api_key: str, message: str, base_dir: Path, uploaded_fi
     Returns:
         dict with response and metadata
     """
-    router = RouterAgent(api_key, base_dir)
+    router = _get_router(api_key, base_dir)
     return router.process_message(message, uploaded_file)
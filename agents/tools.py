@@ -1,28 +1,558 @@
 """
 Custom tools for ADK agents to interact with the filesystem.
 """
+import copy
+import hashlib
+import io
+import json
+import multiprocessing
 import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache, wraps
 from pathlib import Path
+from types import MappingProxyType
 from datetime import datetime
 from typing import Optional
 import PyPDF2
 import pdfplumber
+import pymupdf
+import numpy as np
 import pandas as pd
 
+__all__ = ['FileSystemTools', 'get_fs_tools']
+
+
+def _file_signature(path) -> tuple:
+    """Return (absolute path, mtime in ns, size), which changes whenever the file is rewritten."""
+    st = os.stat(path)
+    return os.path.abspath(path), st.st_mtime_ns, st.st_size
+
+
+def _file_sha256(path) -> str:
+    """Hash a file's contents without reading it into memory at once."""
+    with open(path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+# Buffer size for saved code, text and report files (the default is 8 KiB)
+_WRITE_BUFFER_SIZE = 1 << 20
+
+
+@contextmanager
+def _atomic_open(path: Path):
+    """
+    Open a temporary file next to path for writing text, and rename it over path on success.
+    
+    The data is fsynced before the rename, so path holds either the previous
+    file or the complete new one, never a partial write. On error the
+    temporary file is removed.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}-{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _atomic_write(path: Path, text: str):
+    """Write text to path atomically (see _atomic_open)."""
+    with _atomic_open(path) as f:
+        f.write(text)
+
+
+class _PageText:
+    """Accumulate page texts separated by blank lines, counting words as pages arrive."""
+    
+    def __init__(self):
+        self._buffer = io.StringIO()
+        self.text_pages = 0
+        self.word_count = 0
+    
+    def add(self, text: Optional[str]):
+        """Append a page's text; empty pages are skipped."""
+        if not text:
+            return
+        if self.text_pages:
+            self._buffer.write('\n\n')
+        self._buffer.write(text)
+        self.text_pages += 1
+        self.word_count += len(text.split())
+    
+    def __bool__(self) -> bool:
+        return self.text_pages > 0
+    
+    def getvalue(self) -> str:
+        return self._buffer.getvalue()
+
+
+# Seconds a cached PDF extraction stays valid after its last use (default 7 days);
+# 0 keeps entries until the size cap evicts them
+PDF_CACHE_TTL = int(os.environ.get('PDF_CACHE_TTL', str(7 * 24 * 3600)))
+
+# Total bytes of cached PDF extractions; least recently used entries are evicted
+# on each write beyond it (default 256 MB, 0 disables the cap)
+PDF_CACHE_MAX_BYTES = int(os.environ.get('PDF_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+
+# PDFs with at least this many pages are extracted by a process pool
+PDF_PARALLEL_THRESHOLD = int(os.environ.get('PDF_PARALLEL_THRESHOLD', '50'))
+
+# Pages pdfplumber parses per open document when PyMuPDF cannot read a PDF
+PDF_PAGE_WINDOW = 50
+
+
+def _extract_page_range(pdf_path: str, start: int, end: int) -> list:
+    """Extract the text of pages [start, end) with PyMuPDF. Runs in a worker process."""
+    with pymupdf.open(pdf_path) as doc:
+        return [doc[i].get_text("text").rstrip() for i in range(start, end)]
+
+
+# Process pool shared by all large-PDF extractions (see _get_pdf_pool)
+_PDF_POOL = None
+_PDF_POOL_LOCK = threading.Lock()
+
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    """
+    Return the process-wide PDF extraction pool, created on first use.
+    
+    Workers are started by a forkserver (or spawned where that is unavailable)
+    rather than forked from the threaded server process, so they never inherit
+    locks held by its other threads.
+    """
+    global _PDF_POOL
+    with _PDF_POOL_LOCK:
+        if _PDF_POOL is None:
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _PDF_POOL = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context(method)
+            )
+        return _PDF_POOL
+
+
+def _extract_pages_parallel(pdf_path: str, page_count: int, workers: int):
+    """Yield page texts in page order, extracted in contiguous page ranges by the process pool."""
+    global _PDF_POOL
+    bounds = [page_count * i // workers for i in range(workers + 1)]
+    pool = _get_pdf_pool()
+    futures = [
+        pool.submit(_extract_page_range, pdf_path, bounds[i], bounds[i + 1])
+        for i in range(workers)
+    ]
+    try:
+        for future in futures:
+            yield from future.result()
+    except BrokenProcessPool:
+        # A worker died; let the next request start a fresh pool
+        with _PDF_POOL_LOCK:
+            if _PDF_POOL is pool:
+                _PDF_POOL = None
+        pool.shutdown(wait=False)
+        raise
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+@lru_cache(maxsize=8)
+def _load_df(signature: tuple) -> pd.DataFrame:
+    """Parse a CSV file. Cached per file signature so an unchanged file is parsed once."""
+    return pd.read_csv(signature[0])
+
+
+# CSV files larger than this many bytes are profiled chunk by chunk instead of loaded whole
+CSV_CHUNK_THRESHOLD = int(os.environ.get('CSV_CHUNK_THRESHOLD', str(100 * 1024 * 1024)))
+CSV_CHUNK_ROWS = 50_000
+
+# Rows kept in the uniform sample that approximates quartiles of chunked files
+_QUANTILE_SAMPLE_ROWS = 100_000
+
+# Distinct values counted per text column of a chunked file; beyond this only the
+# most frequent are kept and the unique count is estimated
+CSV_MAX_TRACKED_VALUES = 100_000
+_DISTINCT_SKETCH_SIZE = 4096
+
+# Row hashes of chunked files are spilled to this many files by their top bits, so
+# duplicate counting holds one bucket in memory at a time
+_ROW_HASH_BUCKETS = 256
+
+
+# Dtype read_csv gives text columns (str on pandas 3, object before)
+_TEXT_DTYPE = pd.Series(dtype='str').dtype
+
+
+def _is_number_dtype(dtype) -> bool:
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+def _merge_dtype(current, new):
+    """Widen a column dtype the way a single read_csv over both chunks would."""
+    if current is None or current == new:
+        return new
+    if _is_number_dtype(current) and _is_number_dtype(new):
+        return np.dtype('float64')
+    # Booleans with missing values parse as object
+    if {current, new} <= {np.dtype(bool), np.dtype(object)}:
+        return np.dtype(object)
+    # Anything else mixed (numbers and text, booleans and numbers) is read as text
+    return _TEXT_DTYPE
+
+
+def _scan_csv_dtypes(csv_path) -> dict:
+    """
+    Infer the dtype of every column of a CSV the way one read_csv of the whole file would.
+    
+    Reads the file in CSV_CHUNK_ROWS-row chunks and merges the per-chunk dtypes, so
+    a column that is numeric in early chunks and text later is reported as text.
+    """
+    dtypes, has_missing = {}, set()
+    for chunk in pd.read_csv(csv_path, chunksize=CSV_CHUNK_ROWS):
+        missing = len(chunk) - chunk.count()
+        has_missing.update(missing[missing > 0].index)
+        for col, dtype in chunk.dtypes.items():
+            # An all-empty chunk parses as float64 and says nothing about the column type
+            if missing[col] < len(chunk):
+                dtypes[col] = _merge_dtype(dtypes.get(col), dtype)
+            else:
+                dtypes.setdefault(col, None)
+    
+    for col, dtype in dtypes.items():
+        if dtype is None:
+            dtypes[col] = np.dtype('float64')  # Never had a value
+        elif col in has_missing and pd.api.types.is_integer_dtype(dtype):
+            dtypes[col] = np.dtype('float64')
+        elif col in has_missing and pd.api.types.is_bool_dtype(dtype):
+            dtypes[col] = np.dtype(object)
+    return dtypes
+
+
+class _ChunkedCsvProfile:
+    """
+    Running per-column aggregates of a CSV read in chunks.
+    
+    Column types are fixed up front (see _scan_csv_dtypes), so every chunk is
+    profiled as the whole column would be. Counts, means, standard deviations
+    (Chan's parallel update of Welford's method), extremes, missing values and
+    duplicate rows are exact. Quartiles come from a uniform bottom-k sample of
+    rows. Categorical value counts are exact up to max_values distinct values
+    per column; past that, only the most frequent are kept (so top values are
+    approximate) and the unique count is a k-minimum-values estimate.
+    
+    Memory is bounded by the sample and value-count limits. Row hashes for
+    duplicate detection are spilled to a temporary directory, removed when the
+    profile is used as a context manager and exits.
+    """
+    
+    def __init__(self, dtypes: dict, sample_size: int = _QUANTILE_SAMPLE_ROWS,
+                 max_values: int = CSV_MAX_TRACKED_VALUES):
+        self.sample_size = sample_size
+        self.num_rows = 0
+        self.columns = None
+        self.dtypes = dtypes
+        self.sample_data = []
+        self.missing = None
+        self.memory_usage = 0
+        self.moments = {}  # column -> [count, mean, M2, min, max]
+        self.max_values = max_values
+        self.value_counts = {}
+        self._sketches = {}  # column -> smallest value hashes, once max_values is exceeded
+        self._hash_dir = tempfile.TemporaryDirectory(prefix='csv_profile_')
+        self._rng = np.random.default_rng(0)
+        self._sample = None
+        self._sample_keys = np.empty(0)
+    
+    def add(self, chunk: pd.DataFrame):
+        """Fold one chunk into the running aggregates."""
+        missing = len(chunk) - chunk.count()
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+            self.sample_data = chunk.head(5).to_dict('records')
+            self.missing = missing
+        else:
+            self.missing = self.missing + missing
+        self.num_rows += len(chunk)
+        self.memory_usage += int(chunk.memory_usage(deep=True).sum())
+        
+        # Object columns not forced at read time (booleans with missing values) may
+        # parse as bool in some chunks; hash them as object so equal rows hash equally
+        recast = {
+            col: object for col, dtype in chunk.dtypes.items()
+            if self.dtype(col) == np.dtype(object) and dtype != np.dtype(object)
+        }
+        hashable = chunk.astype(recast) if recast else chunk
+        self._spill_hashes(pd.util.hash_pandas_object(hashable, index=False).to_numpy())
+        
+        numeric = chunk[self.numeric_columns()]
+        if len(numeric.columns):
+            self._add_moments(numeric)
+            self._add_sample(numeric)
+        
+        for col in self.categorical_columns():
+            self._add_value_counts(col, chunk[col])
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self._hash_dir.cleanup()
+    
+    def _spill_hashes(self, hashes: np.ndarray):
+        # Append each hash to the bucket file chosen by its top bits
+        buckets = hashes >> np.uint64(64 - (_ROW_HASH_BUCKETS.bit_length() - 1))
+        order = np.argsort(buckets, kind='stable')
+        hashes = hashes[order]
+        bounds = np.searchsorted(buckets[order], np.arange(_ROW_HASH_BUCKETS + 1))
+        for bucket in np.flatnonzero(np.diff(bounds)):
+            with open(os.path.join(self._hash_dir.name, str(bucket)), 'ab') as f:
+                hashes[bounds[bucket]:bounds[bucket + 1]].tofile(f)
+    
+    def _add_value_counts(self, col, values: pd.Series):
+        counts = values.value_counts(sort=False)
+        previous = self.value_counts.get(col)
+        if previous is not None:
+            # Values stay in order of first appearance, as value_counts(sort=False)
+            # keeps them, so nlargest breaks ties like _statistics_report
+            counts = pd.concat([previous, counts]).groupby(level=0, sort=False).sum()
+        
+        sketch = self._sketches.get(col)
+        if sketch is not None:
+            self._sketches[col] = self._add_sketch(sketch, values.dropna())
+        elif len(counts) > self.max_values:
+            # Start estimating distinct values from everything seen so far
+            self._sketches[col] = self._add_sketch(None, counts.index.to_series())
+        if len(counts) > self.max_values:
+            keep = counts.nlargest(self.max_values).index
+            counts = counts[counts.index.isin(keep)]
+        self.value_counts[col] = counts
+    
+    @staticmethod
+    def _add_sketch(sketch, values: pd.Series) -> np.ndarray:
+        # k-minimum-values sketch: the smallest distinct hashes seen
+        hashes = np.unique(pd.util.hash_pandas_object(values.astype(str), index=False).to_numpy())
+        if sketch is not None:
+            hashes = np.union1d(sketch, hashes)
+        return hashes[:_DISTINCT_SKETCH_SIZE]
+    
+    def unique_count(self, col) -> int:
+        """Distinct non-missing values of a categorical column, estimated past max_values."""
+        sketch = self._sketches.get(col)
+        if sketch is None:
+            counts = self.value_counts.get(col)
+            return 0 if counts is None else len(counts)
+        if len(sketch) < _DISTINCT_SKETCH_SIZE:
+            return len(sketch)
+        return int((_DISTINCT_SKETCH_SIZE - 1) * 2.0 ** 64 / float(sketch[-1]))
+    
+    def _add_moments(self, numeric: pd.DataFrame):
+        counts, means = numeric.count(), numeric.mean()
+        m2s = ((numeric - means) ** 2).sum()
+        mins, maxs = numeric.min(), numeric.max()
+        for col in numeric.columns:
+            n_b = int(counts[col])
+            if not n_b:
+                continue
+            state = self.moments.get(col)
+            if state is None:
+                self.moments[col] = [n_b, float(means[col]), float(m2s[col]), float(mins[col]), float(maxs[col])]
+                continue
+            n_a, mean_a, m2_a = state[0], state[1], state[2]
+            n = n_a + n_b
+            delta = float(means[col]) - mean_a
+            state[0] = n
+            state[1] = mean_a + delta * n_b / n
+            state[2] = m2_a + float(m2s[col]) + delta * delta * n_a * n_b / n
+            state[3] = min(state[3], float(mins[col]))
+            state[4] = max(state[4], float(maxs[col]))
+    
+    def _add_sample(self, numeric: pd.DataFrame):
+        # Keep the rows with the smallest random keys: a uniform sample of everything seen
+        keys = self._rng.random(len(numeric))
+        if len(self._sample_keys) >= self.sample_size:
+            keep = keys < self._sample_keys.max()
+            numeric, keys = numeric[keep], keys[keep]
+            if not len(keys):
+                return
+        if self._sample is not None:
+            numeric = pd.concat([self._sample, numeric], ignore_index=True)
+            keys = np.concatenate([self._sample_keys, keys])
+        order = np.argsort(keys, kind='stable')[:self.sample_size]
+        self._sample = numeric.iloc[order].reset_index(drop=True)
+        self._sample_keys = keys[order]
+    
+    @staticmethod
+    def read_dtypes(dtypes: dict) -> dict:
+        """dtype= argument for read_csv forcing the merged number and text types on every chunk."""
+        return {
+            col: dtype for col, dtype in dtypes.items()
+            if dtype == _TEXT_DTYPE or dtype == np.dtype('float64')
+        }
+    
+    def dtype(self, col):
+        """Type of a column across the whole file."""
+        return self.dtypes[col]
+    
+    def numeric_columns(self) -> list:
+        """Columns whose type across the whole file is numeric (booleans excluded)."""
+        return [col for col in self.columns if _is_number_dtype(self.dtype(col))]
+    
+    def categorical_columns(self) -> list:
+        """Columns whose type across the whole file is object or string."""
+        return [
+            col for col in self.columns
+            if pd.api.types.is_object_dtype(self.dtype(col)) or pd.api.types.is_string_dtype(self.dtype(col))
+        ]
+    
+    def summary(self) -> pd.DataFrame:
+        """Numeric summary frame indexed by mean/std/min/max/25%/50%/75%, like _column_profile's."""
+        summary = {}
+        for col in self.numeric_columns():
+            count, mean, m2, low, high = self.moments.get(col, [0, np.nan, np.nan, np.nan, np.nan])
+            if self._sample is not None and col in self._sample:
+                quartiles = self._sample[col].quantile([0.25, 0.50, 0.75]).tolist()
+            else:
+                quartiles = [np.nan] * 3
+            summary[col] = [
+                mean if count else np.nan,
+                float(np.sqrt(m2 / (count - 1))) if count > 1 else np.nan,
+                low, high, *quartiles
+            ]
+        return pd.DataFrame(summary, index=['mean', 'std', 'min', 'max', '25%', '50%', '75%'], dtype=float)
+    
+    def duplicate_count(self) -> int:
+        """Number of rows identical to an earlier row."""
+        duplicates = 0
+        # Equal rows hash equally, so they always land in the same bucket
+        for entry in os.scandir(self._hash_dir.name):
+            hashes = np.fromfile(entry.path, dtype=np.uint64)
+            duplicates += len(hashes) - len(np.unique(hashes))
+        return int(duplicates)
+
+
+# Object columns with fewer distinct values than this share of rows are profiled as categories
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+
+# Successful CSV analysis results, keyed on (method, file signature)
+_RESULT_CACHE_SIZE = 128
+_result_cache = OrderedDict()
+_result_cache_lock = threading.Lock()
+
+
+def _cached_by_file_signature(method):
+    """
+    Memoize a successful CSV analysis result per (path, mtime, size).
+    
+    Rewriting the file changes its signature, so stale results are never returned.
+    Callers get a deep copy, so changing the result never alters the cached entry.
+    """
+    @wraps(method)
+    def wrapper(self, csv_path, *args, **kwargs):
+        try:
+            key = (method.__name__, _file_signature(csv_path))
+        except OSError:
+            return method(self, csv_path, *args, **kwargs)
+        
+        with _result_cache_lock:
+            cached = _result_cache.get(key)
+            if cached is not None:
+                _result_cache.move_to_end(key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+        
+        result = method(self, csv_path, *args, **kwargs)
+        if result.get('status') == 'success':
+            with _result_cache_lock:
+                _result_cache[key] = result
+                _result_cache.move_to_end(key)
+                while len(_result_cache) > _RESULT_CACHE_SIZE:
+                    _result_cache.popitem(last=False)
+            return copy.deepcopy(result)
+        return result
+    
+    return wrapper
+
 
 class FileSystemTools:
     """Tools for file operations used by ADK agents."""
     
+    # File extension per language for saved code; anything else is saved as .txt
+    _EXTENSIONS = MappingProxyType({
+        'python': '.py',
+        'javascript': '.js',
+        'typescript': '.ts',
+        'java': '.java',
+        'cpp': '.cpp',
+        'c': '.c',
+        'html': '.html',
+        'css': '.css',
+        'sql': '.sql',
+        'rust': '.rs',
+    })
+    
+    # Characters not allowed in saved filenames, mapped to '_'
+    _UNSAFE_TABLE = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+    
     def __init__(self, base_dir: Path):
         self.base_dir = base_dir
         self.generated_code_dir = base_dir / 'generated_code'
         self.raw_text_dir = base_dir / 'raw_text'
         self.reports_dir = base_dir / 'reports'
+        self.pdf_cache_dir = self.raw_text_dir / '.cache'
         
         # Ensure directories exist
         self.generated_code_dir.mkdir(exist_ok=True)
         self.raw_text_dir.mkdir(exist_ok=True)
         self.reports_dir.mkdir(exist_ok=True)
+        self.pdf_cache_dir.mkdir(exist_ok=True)
+    
+    def load_csv(self, csv_path: str) -> pd.DataFrame:
+        """
+        Load a CSV file as a DataFrame, reusing the previous parse if the file is unchanged.
+        
+        The returned DataFrame is shared between callers and must not be modified in place.
+        
+        Args:
+            csv_path: Path to the CSV file
+        
+        Returns:
+            Parsed DataFrame
+        """
+        return _load_df(_file_signature(csv_path))
+    
+    def head_csv(self, csv_path: str, n: int = 10) -> pd.DataFrame:
+        """
+        Return the first n rows of a CSV file.
+        
+        Files up to CSV_CHUNK_THRESHOLD bytes reuse the cached parse shared with
+        profile_csv; larger files only have their first n rows read.
+        
+        Args:
+            csv_path: Path to the CSV file
+            n: Number of rows
+        
+        Returns:
+            DataFrame with at most n rows
+        """
+        if os.path.getsize(csv_path) > CSV_CHUNK_THRESHOLD:
+            return pd.read_csv(csv_path, nrows=n)
+        return self.load_csv(csv_path).head(n)
     
     def save_code_to_file(self, code: str, filename: str, language: str = 'python') -> dict:
         """
@@ -41,17 +571,7 @@ class FileSystemTools:
             safe_filename = self._sanitize_filename(filename)
             
             # Add extension if not present
-            extensions = {
-                'python': '.py',
-                'javascript': '.js',
-                'java': '.java',
-                'cpp': '.cpp',
-                'c': '.c',
-                'html': '.html',
-                'css': '.css',
-                'sql': '.sql',
-            }
-            ext = extensions.get(language.lower(), '.txt')
+            ext = self._EXTENSIONS.get(language.lower(), '.txt')
             if not safe_filename.endswith(ext):
                 safe_filename += ext
             
@@ -59,8 +579,7 @@ class FileSystemTools:
             filepath = self.generated_code_dir / safe_filename
             
             # Save file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(code)
+            _atomic_write(filepath, code)
             
             return {
                 'status': 'success',
@@ -81,41 +600,79 @@ class FileSystemTools:
         Args:
             pdf_path: Path to the PDF file
         
+        Results are cached on disk by the SHA-256 of the file contents, so
+        re-uploads of an identical PDF are not parsed again.
+        
         Returns:
             dict with status, text, page_count, and word_count
         """
         try:
-            text_content = []
+            cache_file = self.pdf_cache_dir / f"{_file_sha256(pdf_path)}.json"
+            cached = self._read_pdf_cache(cache_file)
+            if cached is not None:
+                return cached
+            
+            pages = _PageText()
             page_count = 0
+            pymupdf_read = False
             
-            # Try with pdfplumber first (better for complex PDFs)
+            # Try with PyMuPDF first (much faster for plain text extraction)
             try:
-                with pdfplumber.open(pdf_path) as pdf:
-                    page_count = len(pdf.pages)
-                    for page in pdf.pages:
-                        text = page.extract_text()
-                        if text:
-                            text_content.append(text)
+                with pymupdf.open(pdf_path) as doc:
+                    page_count = doc.page_count
+                    workers = min(os.cpu_count() or 1, page_count)
+                    if page_count < PDF_PARALLEL_THRESHOLD or workers < 2:
+                        for page in doc:
+                            pages.add(page.get_text("text").rstrip())
+                
+                # Large documents: split the pages across worker processes
+                if not pages and page_count >= PDF_PARALLEL_THRESHOLD and workers >= 2:
+                    for text in _extract_pages_parallel(str(pdf_path), page_count, workers):
+                        pages.add(text)
+                pymupdf_read = True
             except Exception:
-                # Fallback to PyPDF2
-                with open(pdf_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    page_count = len(pdf_reader.pages)
-                    for page in pdf_reader.pages:
-                        text = page.extract_text()
-                        if text:
-                            text_content.append(text)
+                pages = _PageText()
             
-            full_text = '\n\n'.join(text_content)
-            word_count = len(full_text.split())
+            # Fall back to pdfplumber (better for complex PDFs), then PyPDF2. A PDF that
+            # PyMuPDF read without finding any text has no text layer (e.g. a scan), and
+            # pdfplumber's much slower layout analysis would not find any either.
+            if not pages and not pymupdf_read:
+                try:
+                    if not page_count:
+                        page_count = len(PyPDF2.PdfReader(pdf_path).pages)
+                    # Reopen every PDF_PAGE_WINDOW pages so pdfplumber's caches stay bounded
+                    for start in range(1, page_count + 1, PDF_PAGE_WINDOW):
+                        window = list(range(start, min(start + PDF_PAGE_WINDOW, page_count + 1)))
+                        with pdfplumber.open(pdf_path, pages=window) as pdf:
+                            for page in pdf.pages:
+                                pages.add(page.extract_text(layout=False))
+                                page.close()
+                except Exception:
+                    pages = _PageText()
+                    with open(pdf_path, 'rb') as file:
+                        pdf_reader = PyPDF2.PdfReader(file)
+                        page_count = len(pdf_reader.pages)
+                        for page in pdf_reader.pages:
+                            pages.add(page.extract_text())
             
-            return {
+            full_text = pages.getvalue()
+            word_count = pages.word_count
+            
+            result = {
                 'status': 'success',
                 'text': full_text,
                 'page_count': page_count,
                 'word_count': word_count,
                 'message': f'Extracted {word_count} words from {page_count} pages'
             }
+            
+            try:
+                _atomic_write(cache_file, json.dumps(result))
+                self._prune_pdf_cache()
+            except OSError:
+                pass  # Caching is best-effort
+            
+            return result
         except Exception as e:
             return {
                 'status': 'error',
@@ -125,6 +682,45 @@ class FileSystemTools:
                 'message': f'Error extracting PDF: {str(e)}'
             }
     
+    @staticmethod
+    def _read_pdf_cache(cache_file: Path) -> Optional[dict]:
+        """
+        Return a cached extraction result, or None if missing, expired or unreadable.
+        
+        A hit refreshes the file's mtime, which marks its last use for the TTL
+        and the LRU eviction in _prune_pdf_cache.
+        """
+        try:
+            if PDF_CACHE_TTL and time.time() - cache_file.stat().st_mtime > PDF_CACHE_TTL:
+                cache_file.unlink(missing_ok=True)
+                return None
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                result = json.load(f)
+            os.utime(cache_file)
+            return result
+        except (OSError, ValueError):
+            return None
+    
+    def _prune_pdf_cache(self):
+        """Delete expired cache entries, then the least recently used ones beyond PDF_CACHE_MAX_BYTES."""
+        entries = []
+        for path in self.pdf_cache_dir.glob('*.json'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # Removed by a concurrent prune
+            entries.append((stat.st_mtime, stat.st_size, path))
+        
+        now = time.time()
+        total = sum(size for _, size, _ in entries)
+        # Oldest first, so expired entries go before live ones
+        for mtime, size, path in sorted(entries, key=lambda e: e[0]):
+            expired = PDF_CACHE_TTL and now - mtime > PDF_CACHE_TTL
+            if not expired and (not PDF_CACHE_MAX_BYTES or total <= PDF_CACHE_MAX_BYTES):
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+    
     def save_text_to_file(self, text: str, original_filename: str) -> dict:
         """
         Save extracted text to the raw_text folder.
@@ -143,8 +739,7 @@ class FileSystemTools:
             filepath = self.raw_text_dir / txt_filename
             
             # Save file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(text)
+            _atomic_write(filepath, text)
             
             return {
                 'status': 'success',
@@ -168,47 +763,10 @@ class FileSystemTools:
         Returns:
             dict with structure analysis, summary, and sample data
         """
-        try:
-            # Read CSV
-            df = pd.read_csv(csv_path)
-            
-            # Basic info
-            num_rows, num_cols = df.shape
-            columns = list(df.columns)
-            dtypes = {col: str(dtype) for col, dtype in df.dtypes.items()}
-            
-            # Sample data
-            sample = df.head(5).to_dict('records')
-            
-            # Missing values
-            missing = df.isnull().sum().to_dict()
-            
-            # Numeric columns stats
-            numeric_stats = {}
-            for col in df.select_dtypes(include=['int64', 'float64']).columns:
-                numeric_stats[col] = {
-                    'min': float(df[col].min()),
-                    'max': float(df[col].max()),
-                    'mean': float(df[col].mean()),
-                    'median': float(df[col].median()),
-                }
-            
-            return {
-                'status': 'success',
-                'num_rows': num_rows,
-                'num_cols': num_cols,
-                'columns': columns,
-                'dtypes': dtypes,
-                'sample_data': sample,
-                'missing_values': missing,
-                'numeric_stats': numeric_stats,
-                'message': f'Analyzed CSV with {num_rows} rows and {num_cols} columns'
-            }
-        except Exception as e:
-            return {
-                'status': 'error',
-                'message': f'Error analyzing CSV: {str(e)}'
-            }
+        profile = self.profile_csv(csv_path)
+        if profile['status'] != 'success':
+            return profile
+        return {'status': 'success', **profile['structure']}
     
     def read_file_content(self, filepath: str) -> dict:
         """
@@ -246,54 +804,10 @@ class FileSystemTools:
         Returns:
             dict with comprehensive statistics
         """
-        try:
-            df = pd.read_csv(csv_path)
-            
-            stats_report = {
-                'numeric_columns': {},
-                'categorical_columns': {},
-                'overall': {
-                    'total_rows': int(len(df)),
-                    'total_columns': int(len(df.columns)),
-                    'memory_usage': int(df.memory_usage(deep=True).sum())
-                }
-            }
-            
-            # Numeric column statistics
-            numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns
-            for col in numeric_cols:
-                stats_report['numeric_columns'][col] = {
-                    'count': int(df[col].count()),
-                    'mean': float(df[col].mean()) if not pd.isna(df[col].mean()) else 0.0,
-                    'std': float(df[col].std()) if not pd.isna(df[col].std()) else 0.0,
-                    'min': float(df[col].min()) if not pd.isna(df[col].min()) else 0.0,
-                    'max': float(df[col].max()) if not pd.isna(df[col].max()) else 0.0,
-                    '25%': float(df[col].quantile(0.25)) if not pd.isna(df[col].quantile(0.25)) else 0.0,
-                    '50%': float(df[col].quantile(0.50)) if not pd.isna(df[col].quantile(0.50)) else 0.0,
-                    '75%': float(df[col].quantile(0.75)) if not pd.isna(df[col].quantile(0.75)) else 0.0,
-                    'missing': int(df[col].isnull().sum())
-                }
-            
-            # Categorical column statistics
-            categorical_cols = df.select_dtypes(include=['object']).columns
-            for col in categorical_cols:
-                value_counts = df[col].value_counts().head(10).to_dict()
-                stats_report['categorical_columns'][col] = {
-                    'count': int(df[col].count()),
-                    'unique': int(df[col].nunique()),
-                    'top_values': {str(k): int(v) for k, v in value_counts.items()},
-                    'missing': int(df[col].isnull().sum())
-                }
-            
-            return {
-                'status': 'success',
-                'statistics': stats_report
-            }
-        except Exception as e:
-            return {
-                'status': 'error',
-                'message': f'Error calculating statistics: {str(e)}'
-            }
+        profile = self.profile_csv(csv_path)
+        if profile['status'] != 'success':
+            return profile
+        return {'status': 'success', 'statistics': profile['statistics']}
     
     def check_data_quality(self, csv_path: str) -> dict:
         """
@@ -305,76 +819,337 @@ class FileSystemTools:
         Returns:
             dict with quality check results
         """
+        profile = self.profile_csv(csv_path)
+        if profile['status'] != 'success':
+            return profile
+        return {'status': 'success', 'quality_report': profile['quality']}
+    
+    @_cached_by_file_signature
+    def profile_csv(self, csv_path: str) -> dict:
+        """
+        Profile a CSV file: structure, statistics and data quality from one load.
+        
+        The numeric summary (mean, std, min, max, quartiles) and the per-column
+        missing counts are computed once and shared by all three reports. Files
+        larger than CSV_CHUNK_THRESHOLD bytes are streamed in chunks instead.
+        analyze_csv_structure, calculate_detailed_statistics and check_data_quality
+        return slices of this result.
+        
+        Args:
+            csv_path: Path to the CSV file
+        
+        Returns:
+            dict with status, structure, statistics, and quality
+        """
         try:
-            df = pd.read_csv(csv_path)
+            if os.path.getsize(csv_path) > CSV_CHUNK_THRESHOLD:
+                return self._profile_csv_chunked(csv_path)
             
-            quality_report = {
-                'missing_values': {},
-                'duplicates': {
-                    'total_duplicates': int(df.duplicated().sum()),
-                    'duplicate_percentage': float((df.duplicated().sum() / len(df)) * 100)
-                },
-                'outliers': {},
-                'data_types': {}
-            }
-            
-            # Missing values analysis
-            for col in df.columns:
-                missing_count = int(df[col].isnull().sum())
-                if missing_count > 0:
-                    quality_report['missing_values'][col] = {
-                        'count': missing_count,
-                        'percentage': float((missing_count / len(df)) * 100)
-                    }
-            
-            # Outlier detection for numeric columns (using IQR method)
-            numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns
-            for col in numeric_cols:
-                Q1 = df[col].quantile(0.25)
-                Q3 = df[col].quantile(0.75)
-                IQR = Q3 - Q1
-                outliers = df[(df[col] < (Q1 - 1.5 * IQR)) | (df[col] > (Q3 + 1.5 * IQR))]
-                
-                if len(outliers) > 0:
-                    quality_report['outliers'][col] = {
-                        'count': int(len(outliers)),
-                        'percentage': float((len(outliers) / len(df)) * 100)
-                    }
-            
-            # Data type information
-            for col in df.columns:
-                quality_report['data_types'][col] = str(df[col].dtype)
+            df = self.load_csv(csv_path)
+            profile = self._column_profile(df)
             
             return {
                 'status': 'success',
-                'quality_report': quality_report
+                'structure': self._structure_report(df, *profile),
+                'statistics': self._statistics_report(df, *profile),
+                'quality': self._quality_report(df, *profile)
             }
         except Exception as e:
             return {
                 'status': 'error',
-                'message': f'Error checking data quality: {str(e)}'
+                'message': f'Error profiling CSV: {str(e)}'
             }
     
-    def generate_csv_report(self, csv_path: str, stats: dict, quality: dict) -> dict:
+    def _profile_csv_chunked(self, csv_path: str) -> dict:
+        """
+        Profile a CSV too large to load whole, reading it in CSV_CHUNK_ROWS-row chunks.
+        
+        Peak memory is bounded by the chunk size, the quartile sample, the
+        per-column value-count limit and one bucket of row hashes; the other
+        buckets wait on disk. Quartiles, and the outlier bounds derived from them,
+        are approximate, as are the top values and unique counts of text columns
+        with more than CSV_MAX_TRACKED_VALUES distinct values; everything else
+        matches profile_csv on the loaded file.
+        The file is read three times: to infer the column types, to profile it,
+        and to count outliers once the bounds are known.
+        """
+        # First pass: column types of the whole file, then profile with them fixed
+        dtypes = _scan_csv_dtypes(csv_path)
+        with _ChunkedCsvProfile(dtypes) as acc:
+            read_dtypes = acc.read_dtypes(dtypes)
+            for chunk in pd.read_csv(csv_path, chunksize=CSV_CHUNK_ROWS, dtype=read_dtypes):
+                acc.add(chunk)
+            duplicate_count = acc.duplicate_count()
+        if acc.columns is None:
+            raise ValueError('No columns to parse from file')
+        
+        num_rows, num_cols = acc.num_rows, len(acc.columns)
+        numeric_cols = acc.numeric_columns()
+        summary = acc.summary()
+        missing = acc.missing
+        counts = num_rows - missing
+        dtypes = {col: str(acc.dtype(col)) for col in acc.columns}
+        
+        numeric_stats, numeric_columns = {}, {}
+        filled = summary.fillna(0.0)
+        for col in numeric_cols:
+            numeric_stats[col] = {
+                'min': float(summary[col]['min']),
+                'max': float(summary[col]['max']),
+                'mean': float(summary[col]['mean']),
+                'median': float(summary[col]['50%']),
+            }
+            numeric_columns[col] = {
+                'count': int(counts[col]),
+                **{stat: float(filled[col][stat]) for stat in ('mean', 'std', 'min', 'max', '25%', '50%', '75%')},
+                'missing': int(missing[col])
+            }
+        
+        categorical_columns = {}
+        for col in acc.categorical_columns():
+            value_counts = acc.value_counts.get(col, pd.Series(dtype=float))
+            top_values = value_counts.nlargest(10)
+            categorical_columns[col] = {
+                'count': int(counts[col]),
+                'unique': acc.unique_count(col),
+                'top_values': {str(k): int(v) for k, v in top_values.items()},
+                'missing': int(missing[col])
+            }
+        
+        # Second pass: count values outside the IQR bounds
+        outliers = {}
+        if numeric_cols:
+            iqr = summary.loc['75%'] - summary.loc['25%']
+            lower = summary.loc['25%'] - 1.5 * iqr
+            upper = summary.loc['75%'] + 1.5 * iqr
+            outlier_counts = pd.Series(0, index=numeric_cols)
+            for chunk in pd.read_csv(csv_path, chunksize=CSV_CHUNK_ROWS, usecols=numeric_cols):
+                values = chunk.apply(pd.to_numeric, errors='coerce')
+                outlier_counts += ((values < lower) | (values > upper)).sum()
+            outliers = {
+                col: {'count': int(n), 'percentage': float((n / num_rows) * 100)}
+                for col, n in outlier_counts.items() if n > 0
+            }
+        
+        return {
+            'status': 'success',
+            'structure': {
+                'num_rows': num_rows,
+                'num_cols': num_cols,
+                'columns': list(acc.columns),
+                'dtypes': dtypes,
+                'sample_data': acc.sample_data,
+                'missing_values': missing.to_dict(),
+                'numeric_stats': numeric_stats,
+                'message': f'Analyzed CSV with {num_rows} rows and {num_cols} columns'
+            },
+            'statistics': {
+                'numeric_columns': numeric_columns,
+                'categorical_columns': categorical_columns,
+                'overall': {
+                    'total_rows': int(num_rows),
+                    'total_columns': int(num_cols),
+                    'memory_usage': int(acc.memory_usage)
+                }
+            },
+            'quality': {
+                'missing_values': {
+                    col: {'count': int(n), 'percentage': float((n / num_rows) * 100)}
+                    for col, n in missing.items() if n > 0
+                },
+                'duplicates': {
+                    'total_duplicates': duplicate_count,
+                    'duplicate_percentage': float((duplicate_count / num_rows) * 100) if num_rows else 0.0
+                },
+                'outliers': outliers,
+                'data_types': dtypes
+            }
+        }
+    
+    @staticmethod
+    def _column_profile(df: pd.DataFrame) -> tuple:
+        """
+        Compute the intermediates shared by the profile reports.
+        
+        Object columns with few distinct values are converted to the category
+        dtype, so value counts, unique counts and duplicate detection run on
+        integer codes instead of hashing Python strings each time.
+        
+        Returns:
+            (numeric columns, categorical columns, summary frame indexed by
+            mean/std/min/max/25%/50%/75%, per-column missing counts)
+        """
+        numeric = df.select_dtypes(include='number')
+        if len(numeric.columns):
+            summary = pd.concat([
+                numeric.agg(['mean', 'std', 'min', 'max']),
+                numeric.quantile([0.25, 0.50, 0.75]).set_axis(['25%', '50%', '75%'])
+            ]).astype(float)
+        else:
+            summary = pd.DataFrame(index=['mean', 'std', 'min', 'max', '25%', '50%', '75%'], dtype=float)
+        
+        categorical = df.select_dtypes(include=['object', 'string', 'category'])
+        if len(categorical):
+            converted = {}
+            for col in categorical.columns:
+                if isinstance(categorical[col].dtype, pd.CategoricalDtype):
+                    continue
+                # Categories in order of first appearance keep value_counts' tie order
+                codes, uniques = pd.factorize(categorical[col])
+                if len(uniques) / len(codes) < CATEGORY_MAX_UNIQUE_RATIO:
+                    converted[col] = pd.Categorical.from_codes(codes, uniques)
+            if converted:
+                categorical = categorical.assign(**converted)
+        
+        # count() is one pass per column with no full-size boolean mask
+        return numeric, categorical, summary, len(df) - df.count()
+    
+    @staticmethod
+    def _structure_report(df: pd.DataFrame, numeric: pd.DataFrame, categorical: pd.DataFrame,
+                          summary: pd.DataFrame, missing: pd.Series) -> dict:
+        """Build the structure analysis: shape, dtypes, sample rows and basic numeric stats."""
+        num_rows, num_cols = df.shape
+        
+        # Numeric columns stats
+        numeric_stats = {}
+        for col in numeric.columns:
+            col_summary = summary[col]
+            numeric_stats[col] = {
+                'min': float(col_summary['min']),
+                'max': float(col_summary['max']),
+                'mean': float(col_summary['mean']),
+                'median': float(col_summary['50%']),
+            }
+        
+        return {
+            'num_rows': num_rows,
+            'num_cols': num_cols,
+            'columns': list(df.columns),
+            'dtypes': {col: str(dtype) for col, dtype in df.dtypes.items()},
+            'sample_data': df.head(5).to_dict('records'),
+            'missing_values': missing.to_dict(),
+            'numeric_stats': numeric_stats,
+            'message': f'Analyzed CSV with {num_rows} rows and {num_cols} columns'
+        }
+    
+    @staticmethod
+    def _statistics_report(df: pd.DataFrame, numeric: pd.DataFrame, categorical: pd.DataFrame,
+                           summary: pd.DataFrame, missing: pd.Series) -> dict:
+        """Build the statistics report from the shared numeric summary."""
+        counts = len(df) - missing
+        
+        stats_report = {
+            'numeric_columns': {},
+            'categorical_columns': {},
+            'overall': {
+                'total_rows': int(len(df)),
+                'total_columns': int(len(df.columns)),
+                'memory_usage': int(df.memory_usage(deep=True).sum())
+            }
+        }
+        
+        # Numeric column statistics
+        filled = summary.fillna(0.0)
+        for col in numeric.columns:
+            col_summary = filled[col]
+            stats_report['numeric_columns'][col] = {
+                'count': int(counts[col]),
+                'mean': float(col_summary['mean']),
+                'std': float(col_summary['std']),
+                'min': float(col_summary['min']),
+                'max': float(col_summary['max']),
+                '25%': float(col_summary['25%']),
+                '50%': float(col_summary['50%']),
+                '75%': float(col_summary['75%']),
+                'missing': int(missing[col])
+            }
+        
+        # Categorical column statistics
+        if len(categorical.columns):
+            unique_counts = categorical.nunique()
+            for col in categorical.columns:
+                # Top 10 without sorting the whole unique-value index
+                value_counts = categorical[col].value_counts(sort=False).nlargest(10).to_dict()
+                stats_report['categorical_columns'][col] = {
+                    'count': int(counts[col]),
+                    'unique': int(unique_counts[col]),
+                    'top_values': {str(k): int(v) for k, v in value_counts.items()},
+                    'missing': int(missing[col])
+                }
+        
+        return stats_report
+    
+    @staticmethod
+    def _quality_report(df: pd.DataFrame, numeric: pd.DataFrame, categorical: pd.DataFrame,
+                        summary: pd.DataFrame, missing: pd.Series) -> dict:
+        """Build the data quality report with vectorized missing-value and IQR outlier checks."""
+        num_rows = len(df)
+        duplicate_count = int(df.assign(**categorical).duplicated().sum())
+        
+        quality_report = {
+            'missing_values': {},
+            'duplicates': {
+                'total_duplicates': duplicate_count,
+                'duplicate_percentage': float((duplicate_count / num_rows) * 100) if num_rows else 0.0
+            },
+            'outliers': {},
+            'data_types': {col: str(dtype) for col, dtype in df.dtypes.items()}
+        }
+        
+        # Missing values analysis
+        for col, missing_count in missing.items():
+            if missing_count > 0:
+                quality_report['missing_values'][col] = {
+                    'count': int(missing_count),
+                    'percentage': float((missing_count / num_rows) * 100)
+                }
+        
+        # Outlier detection for numeric columns (using IQR method)
+        if len(numeric.columns):
+            q1 = summary.loc['25%', numeric.columns].to_numpy()
+            q3 = summary.loc['75%', numeric.columns].to_numpy()
+            iqr = q3 - q1
+            # One float64 block compared against per-column bounds; NaNs never count
+            values = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+            outlier_counts = ((values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr)).sum(axis=0)
+            for col, outlier_count in zip(numeric.columns, outlier_counts):
+                if outlier_count > 0:
+                    quality_report['outliers'][col] = {
+                        'count': int(outlier_count),
+                        'percentage': float((outlier_count / num_rows) * 100)
+                    }
+        
+        return quality_report
+    
+    def generate_csv_report(self, csv_path: str, stats: Optional[dict] = None,
+                            quality: Optional[dict] = None) -> dict:
         """
         Generate an HTML report with statistics and quality checks.
         
         Args:
             csv_path: Path to the CSV file
-            stats: Statistics dictionary
-            quality: Quality report dictionary
+            stats: Statistics dictionary; taken from profile_csv if omitted
+            quality: Quality report dictionary; taken from profile_csv if omitted
         
         Returns:
             dict with report file path
         """
         try:
+            if stats is None or quality is None:
+                profile = self.profile_csv(csv_path)
+                if profile['status'] != 'success':
+                    return profile
+                stats = profile['statistics'] if stats is None else stats
+                quality = profile['quality'] if quality is None else quality
+            
             csv_name = Path(csv_path).stem
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             report_filename = f"{csv_name}_report_{timestamp}.html"
             report_path = self.reports_dir / report_filename
             
-            # Create HTML report
-            html_content = f"""
+            # Write the report straight to disk as it is built
+            with _atomic_open(report_path) as f:
+                f.write(f"""
             <!DOCTYPE html>
             <html>
             <head>
@@ -413,13 +1188,13 @@ class FileSystemTools:
                     </div>
                     
                     <h2>Numeric Columns Statistics</h2>
-            """
-            
-            # Add numeric statistics table
-            if stats.get('numeric_columns'):
-                html_content += "<table><tr><th>Column</th><th>Mean</th><th>Std</th><th>Min</th><th>Max</th><th>Missing</th></tr>"
-                for col, col_stats in stats['numeric_columns'].items():
-                    html_content += f"""
+            """)
+                
+                # Add numeric statistics table
+                if stats.get('numeric_columns'):
+                    f.write("<table><tr><th>Column</th><th>Mean</th><th>Std</th><th>Min</th><th>Max</th><th>Missing</th></tr>")
+                    for col, col_stats in stats['numeric_columns'].items():
+                        f.write(f"""
                     <tr>
                         <td><strong>{col}</strong></td>
                         <td>{col_stats.get('mean', 0):.2f}</td>
@@ -428,49 +1203,45 @@ class FileSystemTools:
                         <td>{col_stats.get('max', 0):.2f}</td>
                         <td>{col_stats.get('missing', 0)}</td>
                     </tr>
-                    """
-                html_content += "</table>"
-            
-            # Add categorical statistics
-            if stats.get('categorical_columns'):
-                html_content += "<h2>Categorical Columns</h2><table><tr><th>Column</th><th>Unique Values</th><th>Missing</th></tr>"
-                for col, col_stats in stats['categorical_columns'].items():
-                    html_content += f"""
+                    """)
+                    f.write("</table>")
+                
+                # Add categorical statistics
+                if stats.get('categorical_columns'):
+                    f.write("<h2>Categorical Columns</h2><table><tr><th>Column</th><th>Unique Values</th><th>Missing</th></tr>")
+                    for col, col_stats in stats['categorical_columns'].items():
+                        f.write(f"""
                     <tr>
                         <td><strong>{col}</strong></td>
                         <td>{col_stats.get('unique', 0)}</td>
                         <td>{col_stats.get('missing', 0)}</td>
                     </tr>
-                    """
-                html_content += "</table>"
-            
-            # Add quality report
-            html_content += "<h2>Data Quality Report</h2>"
-            
-            if quality.get('missing_values'):
-                html_content += '<div class="warning"><strong>⚠ Missing Values Detected</strong><ul>'
-                for col, info in quality['missing_values'].items():
-                    html_content += f"<li><strong>{col}</strong>: {info['count']} missing ({info['percentage']:.2f}%)</li>"
-                html_content += "</ul></div>"
-            
-            if quality.get('duplicates', {}).get('total_duplicates', 0) > 0:
-                html_content += f'<div class="warning"><strong>⚠ Duplicate Rows</strong><p>{quality["duplicates"]["total_duplicates"]} duplicate rows found ({quality["duplicates"]["duplicate_percentage"]:.2f}%)</p></div>'
-            
-            if quality.get('outliers'):
-                html_content += '<div class="info"><strong>ℹ Outliers Detected</strong><ul>'
-                for col, info in quality['outliers'].items():
-                    html_content += f"<li><strong>{col}</strong>: {info['count']} outliers ({info['percentage']:.2f}%)</li>"
-                html_content += "</ul></div>"
-            
-            html_content += """
+                    """)
+                    f.write("</table>")
+                
+                # Add quality report
+                f.write("<h2>Data Quality Report</h2>")
+                
+                if quality.get('missing_values'):
+                    f.write('<div class="warning"><strong>⚠ Missing Values Detected</strong><ul>')
+                    for col, info in quality['missing_values'].items():
+                        f.write(f"<li><strong>{col}</strong>: {info['count']} missing ({info['percentage']:.2f}%)</li>")
+                    f.write("</ul></div>")
+                
+                if quality.get('duplicates', {}).get('total_duplicates', 0) > 0:
+                    f.write(f'<div class="warning"><strong>⚠ Duplicate Rows</strong><p>{quality["duplicates"]["total_duplicates"]} duplicate rows found ({quality["duplicates"]["duplicate_percentage"]:.2f}%)</p></div>')
+                
+                if quality.get('outliers'):
+                    f.write('<div class="info"><strong>ℹ Outliers Detected</strong><ul>')
+                    for col, info in quality['outliers'].items():
+                        f.write(f"<li><strong>{col}</strong>: {info['count']} outliers ({info['percentage']:.2f}%)</li>")
+                    f.write("</ul></div>")
+                
+                f.write("""
                 </div>
             </body>
             </html>
-            """
-            
-            # Save report
-            with open(report_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            """)
             
             return {
                 'status': 'success',
@@ -483,13 +1254,11 @@ class FileSystemTools:
                 'message': f'Error generating report: {str(e)}'
             }
     
-    @staticmethod
-    def _sanitize_filename(filename: str) -> str:
+    @classmethod
+    def _sanitize_filename(cls, filename: str) -> str:
         """Sanitize filename to remove unsafe characters."""
-        # Remove or replace unsafe characters
-        unsafe_chars = '<>:"/\\|?*'
-        for char in unsafe_chars:
-            filename = filename.replace(char, '_')
+        # Replace unsafe characters in a single pass
+        filename = filename.translate(cls._UNSAFE_TABLE)
         
         # Limit length
         if len(filename) > 200:
@@ -500,3 +1269,24 @@ class FileSystemTools:
             filename = f"file_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
         return filename
+
+
+@lru_cache(maxsize=16)
+def _fs_tools_for(base_dir: str) -> FileSystemTools:
+    return FileSystemTools(Path(base_dir))
+
+
+def get_fs_tools(base_dir) -> FileSystemTools:
+    """
+    Return the FileSystemTools instance shared by all agents for a base directory.
+    
+    FileSystemTools holds no per-call state, so one instance can serve
+    concurrent requests.
+    
+    Args:
+        base_dir: Base directory for file operations
+    
+    Returns:
+        FileSystemTools instance
+    """
+    return _fs_tools_for(str(base_dir))
@@ -17,7 +17,7 @@ class ChatSessionAdmin(admin.ModelAdmin):
 class ChatMessageAdmin(admin.ModelAdmin):
     list_display = ('id', 'session', 'role', 'mode', 'created_at')
     list_filter = ('role', 'mode', 'created_at')
-    search_fields = ('content', 'session__id')
+    search_fields = ('content', 'error_summary', 'session__id')
     readonly_fields = ('id', 'created_at')
 
 
@@ -1,9 +1,23 @@
 """
 AppConfig for chatbot app.
 """
+from pathlib import Path
 from django.apps import AppConfig
+from django.conf import settings
+from django.utils.functional import cached_property
 
 
 class ChatbotConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'chatbot'
+    
+    @cached_property
+    def router(self):
+        """
+        Process-wide RouterAgent shared by all requests.
+        
+        Created on first use rather than in ready(), so management commands
+        do not need a Groq API key.
+        """
+        from agents.router_agent import RouterAgent
+        return RouterAgent(api_key=settings.GROQ_API_KEY, base_dir=Path(settings.BASE_DIR))
@@ -0,0 +1,60 @@
+"""
+Exception handler for the chatbot API views.
+"""
+import traceback
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist, ValidationError as DjangoValidationError
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import exception_handler
+
+from .models import ChatSession
+
+
+# Error messages of 404 responses by the missing model's DoesNotExist class
+_NOT_FOUND_MESSAGES = {
+    ChatSession.DoesNotExist: 'Session not found',
+}
+
+
+def handler(exc, context):
+    """
+    Turn an exception raised by an API view into an {'error': ...} response.
+    
+    Args:
+        exc: The raised exception
+        context: DRF context with the view and request
+    
+    Returns:
+        Response with status 404 for missing objects, 400 for invalid input,
+        the exception's own status for other DRF exceptions and 500 otherwise
+    """
+    if isinstance(exc, ObjectDoesNotExist):
+        return Response(
+            {'error': _NOT_FOUND_MESSAGES.get(type(exc), 'Not found')},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    if isinstance(exc, DjangoValidationError):
+        return Response(
+            {'error': ' '.join(exc.messages)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    # Http404, PermissionDenied and DRF's APIException subclasses
+    response = exception_handler(exc, context)
+    if response is not None:
+        # Serializer errors keep DRF's per-field layout
+        if not isinstance(exc, ValidationError) and 'detail' in response.data:
+            response.data = {'error': response.data['detail']}
+        return response
+    
+    error_trace = traceback.format_exc()
+    print(f"[ERROR] Exception in {context['view'].__class__.__name__}:")
+    print(error_trace)
+    
+    data = {'error': str(exc)}
+    if settings.DEBUG:
+        data['traceback'] = error_trace
+    return Response(data, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-15 18:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chatbot', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='uploadedfile',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed')], db_index=True, default='pending', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='agentexecution',
+            index=models.Index(fields=['session', '-created_at'], name='chatbot_age_session_c13a92_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chatmessage',
+            index=models.Index(fields=['session', 'created_at'], name='chatbot_cha_session_24e989_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='uploadedfile',
+            index=models.Index(fields=['session', '-uploaded_at'], name='chatbot_upl_session_3a6132_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-15 18:01
+
+import chatbot.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chatbot', '0002_session_indexes'),
+    ]
+
+    # The default is applied in Python only, so the tables do not need rebuilding
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='agentexecution',
+                    name='id',
+                    field=models.UUIDField(default=chatbot.models.uuid7, editable=False, primary_key=True, serialize=False),
+                ),
+                migrations.AlterField(
+                    model_name='chatmessage',
+                    name='id',
+                    field=models.UUIDField(default=chatbot.models.uuid7, editable=False, primary_key=True, serialize=False),
+                ),
+                migrations.AlterField(
+                    model_name='chatsession',
+                    name='id',
+                    field=models.UUIDField(default=chatbot.models.uuid7, editable=False, primary_key=True, serialize=False),
+                ),
+                migrations.AlterField(
+                    model_name='uploadedfile',
+                    name='id',
+                    field=models.UUIDField(default=chatbot.models.uuid7, editable=False, primary_key=True, serialize=False),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-15 18:05
+
+from django.db import migrations, models
+
+
+def fill_error_summary(apps, schema_editor):
+    ChatMessage = apps.get_model('chatbot', 'ChatMessage')
+    messages = list(ChatMessage.objects.filter(mode='error').only('id', 'metadata'))
+    for message in messages:
+        message.error_summary = str((message.metadata or {}).get('error', ''))[:255]
+    ChatMessage.objects.bulk_update(messages, ['error_summary'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chatbot', '0003_uuid7_ids'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatmessage',
+            name='error_summary',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='chatmessage',
+            index=models.Index(condition=models.Q(('mode', 'error')), fields=['-created_at'], name='chatbot_message_errors_idx'),
+        ),
+        migrations.RunPython(fill_error_summary, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations
+
+
+def fill_error_summary(apps, schema_editor):
+    # 0004 only read metadata['error']; router results with mode 'error' carry a 'message'
+    ChatMessage = apps.get_model('chatbot', 'ChatMessage')
+    messages = list(ChatMessage.objects.filter(mode='error', error_summary='').only('id', 'metadata'))
+    for message in messages:
+        metadata = message.metadata or {}
+        message.error_summary = str(metadata.get('error') or metadata.get('message') or '')[:255]
+    ChatMessage.objects.bulk_update(messages, ['error_summary'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chatbot', '0004_message_error_summary'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_error_summary, migrations.RunPython.noop),
+    ]
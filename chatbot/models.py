@@ -3,13 +3,28 @@ Django models for the chatbot application.
 """
 from django.db import models
 from django.utils import timezone
+import os
+import time
 import uuid
 
 
+def uuid7() -> uuid.UUID:
+    """
+    Generate a version 7 UUID: a 48-bit Unix millisecond timestamp followed by random bits.
+    
+    Keys increase over time, so new rows are appended at the end of the primary
+    key and foreign key indexes instead of being scattered across them.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), 'big')
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # Version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
 class ChatSession(models.Model):
     """Represents a chat session."""
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
     title = models.CharField(max_length=255, default="New Chat")
@@ -39,16 +54,26 @@ class ChatMessage(models.Model):
         ('error', 'Error'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     session = models.ForeignKey(ChatSession, on_delete=models.CASCADE, related_name='messages')
     role = models.CharField(max_length=10, choices=ROLE_CHOICES)
     content = models.TextField()
     mode = models.CharField(max_length=20, choices=MODE_CHOICES, default='general_chat')
     metadata = models.JSONField(default=dict, blank=True)
+    # Error text of mode='error' messages, queryable without reading metadata
+    error_summary = models.CharField(max_length=255, blank=True, default='')
     created_at = models.DateTimeField(default=timezone.now)
     
     class Meta:
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['session', 'created_at']),
+            models.Index(
+                fields=['-created_at'],
+                name='chatbot_message_errors_idx',
+                condition=models.Q(mode='error')
+            ),
+        ]
     
     def __str__(self):
         return f"{self.role}: {self.content[:50]}..."
@@ -70,19 +95,20 @@ class UploadedFile(models.Model):
         ('other', 'Other'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     session = models.ForeignKey(ChatSession, on_delete=models.CASCADE, related_name='files')
     message = models.ForeignKey(ChatMessage, on_delete=models.CASCADE, related_name='files', null=True, blank=True)
     file = models.FileField(upload_to='uploads/%Y/%m/%d/')
     file_type = models.CharField(max_length=10, choices=FILE_TYPE_CHOICES)
     original_filename = models.CharField(max_length=255)
-    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', db_index=True)
     result = models.JSONField(default=dict, blank=True)
     uploaded_at = models.DateTimeField(default=timezone.now)
     processed_at = models.DateTimeField(null=True, blank=True)
     
     class Meta:
         ordering = ['-uploaded_at']
+        indexes = [models.Index(fields=['session', '-uploaded_at'])]
     
     def __str__(self):
         return f"{self.original_filename} - {self.status}"
@@ -98,7 +124,7 @@ class AgentExecution(models.Model):
         ('csv', 'CSV Analysis Agent'),
     ]
     
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     session = models.ForeignKey(ChatSession, on_delete=models.CASCADE, related_name='executions')
     message = models.ForeignKey(ChatMessage, on_delete=models.CASCADE, related_name='executions')
     agent_type = models.CharField(max_length=20, choices=AGENT_CHOICES)
@@ -111,6 +137,7 @@ class AgentExecution(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [models.Index(fields=['session', '-created_at'])]
     
     def __str__(self):
         return f"{self.agent_type} - {self.created_at}"
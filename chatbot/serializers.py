@@ -1,20 +1,54 @@
 """
 Serializers for chatbot API.
 """
+from copy import copy, deepcopy
 from rest_framework import serializers
 from .models import ChatSession, ChatMessage, UploadedFile
 
 
-class ChatMessageSerializer(serializers.ModelSerializer):
+# Field maps built by CachedFieldsMixin, keyed on serializer class
+_FIELDS_CACHE = {}
+
+
+class CachedFieldsMixin:
+    """
+    Build a ModelSerializer's fields once per class instead of on every instantiation.
+    
+    DRF deep-copies the declared fields and rebuilds the model fields each time a
+    serializer is created. Here the result only depends on the class, so it is
+    cached and every instance binds its own copies: nested serializers are
+    deep-copied, plain fields shallow-copied.
+    """
+    
+    def get_fields(self):
+        fields = _FIELDS_CACHE.get(type(self))
+        if fields is None:
+            fields = _FIELDS_CACHE[type(self)] = super().get_fields()
+        return {
+            name: deepcopy(field) if isinstance(field, serializers.BaseSerializer) else copy(field)
+            for name, field in fields.items()
+        }
+
+
+class ChatMessageSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for chat messages."""
     
     class Meta:
         model = ChatMessage
         fields = ['id', 'role', 'content', 'mode', 'metadata', 'created_at']
+        # Fields for list responses, which leave out the (large) metadata
+        fields_lite = ['id', 'role', 'content', 'mode', 'created_at']
         read_only_fields = ['id', 'created_at']
 
 
-class ChatSessionSerializer(serializers.ModelSerializer):
+class ChatMessageLiteSerializer(ChatMessageSerializer):
+    """Serializer for chat messages without their metadata."""
+    
+    class Meta(ChatMessageSerializer.Meta):
+        fields = ChatMessageSerializer.Meta.fields_lite
+
+
+class ChatSessionSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for chat sessions."""
     
     messages = ChatMessageSerializer(many=True, read_only=True)
@@ -26,10 +60,19 @@ class ChatSessionSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
     
     def get_message_count(self, obj):
+        # Reuse prefetched messages instead of issuing a COUNT query
+        if 'messages' in getattr(obj, '_prefetched_objects_cache', {}):
+            return len(obj.messages.all())
         return obj.messages.count()
 
 
-class UploadedFileSerializer(serializers.ModelSerializer):
+class ChatSessionLiteSerializer(ChatSessionSerializer):
+    """Serializer for chat sessions whose messages leave out their metadata."""
+    
+    messages = ChatMessageLiteSerializer(many=True, read_only=True)
+
+
+class UploadedFileSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     """Serializer for uploaded files."""
     
     class Meta:
@@ -44,9 +87,4 @@ class ChatMessageCreateSerializer(serializers.Serializer):
     session_id = serializers.UUIDField()
     message = serializers.CharField()
     file = serializers.FileField(required=False, allow_null=True)
-    
-    def validate_session_id(self, value):
-        """Validate that session exists."""
-        if not ChatSession.objects.filter(id=value).exists():
-            raise serializers.ValidationError("Session not found")
-        return value
+    background = serializers.BooleanField(required=False, default=False)
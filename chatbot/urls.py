@@ -15,6 +15,7 @@ urlpatterns = [
     path('api/chat/sessions/<uuid:session_id>/', views.get_session, name='get_session'),
     path('api/chat/sessions/<uuid:session_id>/messages/', views.get_messages, name='get_messages'),
     path('api/chat/message/', views.send_message, name='send_message'),
+    path('api/chat/message/<uuid:task_id>/', views.get_message_result, name='get_message_result'),
     path('api/chat/upload/', views.upload_file, name='upload_file'),
     path('api/chat/action/', views.execute_csv_action, name='execute_csv_action'),
 ]
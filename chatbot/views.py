@@ -1,125 +1,352 @@
 """
 Views and API endpoints for the chatbot application.
 """
-from django.shortcuts import render
+from django.apps import apps
 from django.conf import settings
+from django.http import HttpResponse
+from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response
+from django.db import close_old_connections, transaction
+from django.db.models import Prefetch, Q
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from rest_framework import status
 from rest_framework.decorators import api_view
+from rest_framework.exceptions import ParseError
 from rest_framework.response import Response
-from pathlib import Path
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import hashlib
+import os
+import threading
 import time
+import uuid
 
 from .models import ChatSession, ChatMessage, UploadedFile, AgentExecution
 from .serializers import (
     ChatSessionSerializer,
+    ChatSessionLiteSerializer,
     ChatMessageSerializer,
     ChatMessageCreateSerializer,
     UploadedFileSerializer
 )
-from agents.router_agent import RouterAgent
+
+
+# UploadedFile.file_type by lowercase file extension; anything else is 'other'
+_FILE_TYPES = {'pdf': 'pdf', 'csv': 'csv'}
+
+
+# Messages returned by get_messages per page by default and at most
+MESSAGES_PAGE_SIZE = 50
+MESSAGES_MAX_PAGE_SIZE = 200
+
+
+# Worker threads answering messages sent with "background": true
+_MESSAGE_POOL = ThreadPoolExecutor(max_workers=4)
+
+# Replies of background messages by task id (the user message id) until they are fetched,
+# as (future, submit time) in submission order. Kept in process memory, so polling must
+# reach the process that accepted the message.
+_MESSAGE_TASKS = OrderedDict()
+_MESSAGE_TASKS_LOCK = threading.Lock()
+
+# Finished replies nobody fetched are dropped this many seconds after submission, or
+# oldest first once more than _MESSAGE_TASKS_MAX tasks are held
+_MESSAGE_TASK_TTL = 3600
+_MESSAGE_TASKS_MAX = 1000
+
+
+def _prune_message_tasks():
+    """Drop expired or excess finished tasks. Must be called with _MESSAGE_TASKS_LOCK held."""
+    expired = time.monotonic() - _MESSAGE_TASK_TTL
+    excess = len(_MESSAGE_TASKS) - _MESSAGE_TASKS_MAX
+    for task_id, (future, submitted_at) in list(_MESSAGE_TASKS.items()):
+        if submitted_at >= expired and excess <= 0:
+            break
+        if future.done():
+            del _MESSAGE_TASKS[task_id]
+            excess -= 1
+
+
+@lru_cache(maxsize=None)
+def _index_page():
+    """Render the chatbot interface once and return (html bytes, ETag)."""
+    html = render_to_string('chatbot/index.html').encode('utf-8')
+    return html, f'"{hashlib.md5(html).hexdigest()}"'
 
 
 def index(request):
-    """Render the main chatbot interface."""
-    return render(request, 'chatbot/index.html')
+    """
+    Render the main chatbot interface.
+    
+    The page does not depend on the request, so outside DEBUG it is rendered
+    once per process and revalidated with its ETag (304 when unchanged).
+    """
+    if settings.DEBUG:
+        return render(request, 'chatbot/index.html')
+    
+    html, etag = _index_page()
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(html, content_type='text/html; charset=utf-8')
+    response['ETag'] = etag
+    return response
 
 
 @api_view(['POST'])
 def create_session(request):
     """Create a new chat session."""
-    try:
-        session = ChatSession.objects.create(title="New Chat")
-        serializer = ChatSessionSerializer(session)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
-    except Exception as e:
-        return Response(
-            {'error': str(e)},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+    session = ChatSession.objects.create(title="New Chat")
+    serializer = ChatSessionSerializer(session)
+    return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+def _include_metadata(request):
+    """Return True if the request asked for message metadata with ?include=metadata."""
+    return 'metadata' in request.query_params.get('include', '').split(',')
 
 
 @api_view(['GET'])
 def get_session(request, session_id):
-    """Get a chat session with all messages."""
-    try:
-        session = ChatSession.objects.get(id=session_id)
-        serializer = ChatSessionSerializer(session)
-        return Response(serializer.data)
-    except ChatSession.DoesNotExist:
+    """
+    Get a chat session with all messages.
+    
+    Message metadata is left out unless requested with ?include=metadata.
+    """
+    if _include_metadata(request):
+        message_fields, serializer_class = ChatMessageSerializer.Meta.fields, ChatSessionSerializer
+    else:
+        message_fields, serializer_class = ChatMessageSerializer.Meta.fields_lite, ChatSessionLiteSerializer
+    
+    # Messages are loaded in one prefetch query that also provides message_count
+    session = ChatSession.objects.prefetch_related(
+        Prefetch('messages', queryset=ChatMessage.objects.only(*message_fields, 'session_id'))
+    ).get(id=session_id)
+    serializer = serializer_class(session)
+    return Response(serializer.data)
+
+
+@api_view(['GET'])
+def get_messages(request, session_id):
+    """
+    Get the latest messages of a session in chronological order.
+    
+    Returns at most ?limit= messages (default 50). Older history is paged with
+    ?before=<created_at>&before_id=<id> of the oldest message received; the id
+    orders messages created at the same instant, so none are skipped or repeated.
+    Message metadata is left out unless requested with ?include=metadata.
+    """
+    limit = request.query_params.get('limit', MESSAGES_PAGE_SIZE)
+    limit = min(int(limit), MESSAGES_MAX_PAGE_SIZE) if str(limit).isdigit() else 0
+    if limit < 1:
+        raise ParseError('limit must be a positive integer')
+    
+    before = request.query_params.get('before')
+    if before is not None:
+        try:
+            before = parse_datetime(before)
+        except ValueError:
+            before = None
+        if before is None:
+            raise ParseError('before must be an ISO 8601 timestamp')
+        if timezone.is_naive(before):
+            before = timezone.make_aware(before)
+    
+    before_id = request.query_params.get('before_id')
+    if before_id is not None:
+        if before is None:
+            raise ParseError('before_id requires before')
+        try:
+            before_id = uuid.UUID(before_id)
+        except ValueError:
+            raise ParseError('before_id must be a message id')
+    
+    session = ChatSession.objects.get(id=session_id)
+    # Read-only list: plain dicts skip per-row serializer field work; the
+    # renderer formats the UUIDs and datetimes like ChatMessageSerializer
+    fields = ChatMessageSerializer.Meta.fields if _include_metadata(request) else ChatMessageSerializer.Meta.fields_lite
+    messages = session.messages.order_by('-created_at', '-id')
+    if before_id is not None:
+        messages = messages.filter(Q(created_at__lt=before) | Q(created_at=before, id__lt=before_id))
+    elif before is not None:
+        messages = messages.filter(created_at__lt=before)
+    # Newest page first from the (session, created_at) index, then flipped
+    page = list(messages.values(*fields)[:limit])
+    page.reverse()
+    return Response(page)
+
+
+@api_view(['POST'])
+def send_message(request):
+    """
+    Send a message and get AI response.
+    
+    With "background": true the reply is produced in a worker thread and the
+    response is 202 with a task_id to poll at get_message_result.
+    """
+    serializer = ChatMessageCreateSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    session_id = serializer.validated_data['session_id']
+    user_message = serializer.validated_data['message']
+    uploaded_file = serializer.validated_data.get('file')
+    
+    # A missing session raises DoesNotExist, which the exception handler turns into a 404
+    session = ChatSession.objects.get(id=session_id)
+    
+    # Create user message
+    user_msg = ChatMessage.objects.create(
+        session=session,
+        role='user',
+        content=user_message,
+        mode='general_chat'
+    )
+    
+    # Handle file upload if present
+    uploaded_file_info = None
+    if uploaded_file:
+        uploaded_file_info = _handle_file_upload(session, user_msg, uploaded_file)
+    
+    if serializer.validated_data['background']:
+        # Answer in a worker thread; the client polls get_message_result
+        future = _MESSAGE_POOL.submit(
+            _respond_in_background, session, user_msg, user_message, uploaded_file_info
+        )
+        task_id = str(user_msg.id)
+        with _MESSAGE_TASKS_LOCK:
+            _prune_message_tasks()
+            _MESSAGE_TASKS[task_id] = (future, time.monotonic())
+        return Response({
+            'user_message': ChatMessageSerializer(user_msg).data,
+            'task_id': task_id,
+            'status': 'pending'
+        }, status=status.HTTP_202_ACCEPTED)
+    
+    data, http_status = _respond_to_message(session, user_msg, user_message, uploaded_file_info)
+    return Response(data, status=http_status)
+
+
+@api_view(['GET'])
+def get_message_result(request, task_id):
+    """Get the reply to a message sent with "background": true."""
+    task_id = str(task_id)
+    with _MESSAGE_TASKS_LOCK:
+        _prune_message_tasks()
+        future, _ = _MESSAGE_TASKS.get(task_id, (None, None))
+    
+    if future is None:
         return Response(
-            {'error': 'Session not found'},
+            {'error': 'Task not found'},
             status=status.HTTP_404_NOT_FOUND
         )
+    if not future.done():
+        return Response({'task_id': task_id, 'status': 'pending'}, status=status.HTTP_202_ACCEPTED)
+    
+    with _MESSAGE_TASKS_LOCK:
+        _MESSAGE_TASKS.pop(task_id, None)
+    try:
+        data, http_status = future.result()
     except Exception as e:
         return Response(
-            {'error': str(e)},
+            {'task_id': task_id, 'status': 'failed', 'error': str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
+    return Response({'task_id': task_id, 'status': 'completed', **data}, status=http_status)
 
 
-@api_view(['GET'])
-def get_messages(request, session_id):
-    """Get all messages for a session."""
-    try:
-        session = ChatSession.objects.get(id=session_id)
-        messages = session.messages.all()
-        serializer = ChatMessageSerializer(messages, many=True)
-        return Response(serializer.data)
-    except ChatSession.DoesNotExist:
+@api_view(['POST'])
+def upload_file(request):
+    """Handle file upload."""
+    session_id = request.data.get('session_id')
+    uploaded_file = request.FILES.get('file')
+    
+    if not session_id or not uploaded_file:
         return Response(
-            {'error': 'Session not found'},
-            status=status.HTTP_404_NOT_FOUND
+            {'error': 'session_id and file are required'},
+            status=status.HTTP_400_BAD_REQUEST
         )
-    except Exception as e:
+    
+    session = ChatSession.objects.get(id=session_id)
+    
+    file_record = _save_uploaded_file(session, uploaded_file, status='completed')
+    
+    serializer = UploadedFileSerializer(file_record)
+    return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+@api_view(['POST'])
+def execute_csv_action(request):
+    """Execute a CSV action selected by the user."""
+    session_id = request.data.get('session_id')
+    action_id = request.data.get('action_id')
+    csv_path = request.data.get('csv_path')
+    analysis = request.data.get('analysis', {})
+    
+    print(f"[DEBUG] execute_csv_action called")
+    print(f"[DEBUG] session_id: {session_id}")
+    print(f"[DEBUG] action_id: {action_id}")
+    print(f"[DEBUG] csv_path: {csv_path}")
+    print(f"[DEBUG] analysis keys: {analysis.keys() if analysis else 'None'}")
+    
+    if not all([session_id, action_id, csv_path]):
+        error_msg = f'Missing required fields: session_id={session_id}, action_id={action_id}, csv_path={csv_path}'
+        print(f"[ERROR] {error_msg}")
         return Response(
-            {'error': str(e)},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            {'error': 'session_id, action_id, and csv_path are required'},
+            status=status.HTTP_400_BAD_REQUEST
         )
+    
+    session = ChatSession.objects.get(id=session_id)
+    print(f"[DEBUG] Session found: {session.id}")
+    
+    # Execute action using router agent
+    router = apps.get_app_config('chatbot').router
+    
+    print(f"[DEBUG] Calling router.execute_csv_action...")
+    result = router.execute_csv_action(csv_path, action_id, analysis)
+    print(f"[DEBUG] Result status: {result.get('status')}")
+    print(f"[DEBUG] Result message: {result.get('message', 'No message')}")
+    
+    # Create assistant message with result
+    assistant_msg = _create_assistant_message(session, result)
+    print(f"[DEBUG] Assistant message created: {assistant_msg.id}")
+    
+    return Response({
+        'assistant_message': ChatMessageSerializer(assistant_msg).data,
+        'result': result
+    })
 
 
-@api_view(['POST'])
-def send_message(request):
-    """Send a message and get AI response."""
+def _respond_to_message(session, user_msg, user_message, uploaded_file_info):
+    """
+    Run the router on a user message and store the assistant's reply.
+    
+    Returns:
+        (response data, HTTP status) tuple
+    """
+    # Process message with router agent
+    start_ns = time.monotonic_ns()
+    
     try:
-        serializer = ChatMessageCreateSerializer(data=request.data)
-        if not serializer.is_valid():
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-        
-        session_id = serializer.validated_data['session_id']
-        user_message = serializer.validated_data['message']
-        uploaded_file = serializer.validated_data.get('file')
-        
-        session = ChatSession.objects.get(id=session_id)
+        router = apps.get_app_config('chatbot').router
         
-        # Create user message
-        user_msg = ChatMessage.objects.create(
-            session=session,
-            role='user',
-            content=user_message,
-            mode='general_chat'
+        result = router.process_message(
+            message=user_message,
+            uploaded_file=uploaded_file_info
         )
         
-        # Handle file upload if present
-        uploaded_file_info = None
-        if uploaded_file:
-            uploaded_file_info = _handle_file_upload(session, user_msg, uploaded_file)
-        
-        # Process message with router agent
-        start_time = time.time()
+        execution_time_ms = (time.monotonic_ns() - start_ns) // 1_000_000
         
-        try:
-            router = RouterAgent(
-                api_key=settings.GROQ_API_KEY,
-                base_dir=Path(settings.BASE_DIR)
-            )
-            
-            result = router.process_message(
-                message=user_message,
-                uploaded_file=uploaded_file_info
-            )
-            
-            execution_time_ms = int((time.time() - start_time) * 1000)
+        # Store the response, its execution log and the session timestamp in one
+        # transaction; the LLM call above stays outside it
+        with transaction.atomic():
+            # Update the session timestamp first: the UPDATE locks the session row,
+            # so concurrent replies to one session queue on it instead of
+            # interleaving, with no separate SELECT ... FOR UPDATE round trip
+            ChatSession.objects.filter(pk=session.pk).update(updated_at=timezone.now())
             
             # Create assistant response message
             assistant_msg = _create_assistant_message(session, result)
@@ -134,166 +361,63 @@ def send_message(request):
                 execution_time_ms=execution_time_ms,
                 success=result.get('status') == 'success'
             )
-            
-            # Update session timestamp
-            session.updated_at = timezone.now()
-            session.save()
-            
-            # Return both messages
-            return Response({
-                'user_message': ChatMessageSerializer(user_msg).data,
-                'assistant_message': ChatMessageSerializer(assistant_msg).data,
-                'execution_time_ms': execution_time_ms
-            })
-            
-        except Exception as e:
-            # Create error message
-            error_msg = ChatMessage.objects.create(
-                session=session,
-                role='assistant',
-                content=f"I encountered an error: {str(e)}",
-                mode='error',
-                metadata={'error': str(e)}
-            )
-            
-            return Response({
-                'user_message': ChatMessageSerializer(user_msg).data,
-                'assistant_message': ChatMessageSerializer(error_msg).data,
-                'error': str(e)
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-    
-    except Exception as e:
-        return Response(
-            {'error': str(e)},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
-
-
-@api_view(['POST'])
-def upload_file(request):
-    """Handle file upload."""
-    try:
-        session_id = request.data.get('session_id')
-        uploaded_file = request.FILES.get('file')
         
-        if not session_id or not uploaded_file:
-            return Response(
-                {'error': 'session_id and file are required'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        session = ChatSession.objects.get(id=session_id)
-        
-        # Determine file type
-        file_ext = uploaded_file.name.lower().split('.')[-1]
-        file_type = 'pdf' if file_ext == 'pdf' else 'csv' if file_ext == 'csv' else 'other'
+        # Return both messages
+        return {
+            'user_message': ChatMessageSerializer(user_msg).data,
+            'assistant_message': ChatMessageSerializer(assistant_msg).data,
+            'execution_time_ms': execution_time_ms
+        }, status.HTTP_200_OK
         
-        # Create UploadedFile record
-        file_record = UploadedFile.objects.create(
+    except Exception as e:
+        # Create error message
+        error_msg = ChatMessage.objects.create(
             session=session,
-            file=uploaded_file,
-            file_type=file_type,
-            original_filename=uploaded_file.name,
-            status='completed'
+            role='assistant',
+            content=f"I encountered an error: {str(e)}",
+            mode='error',
+            metadata={'error': str(e)},
+            error_summary=str(e)[:255]
         )
         
-        serializer = UploadedFileSerializer(file_record)
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
-        
-    except ChatSession.DoesNotExist:
-        return Response(
-            {'error': 'Session not found'},
-            status=status.HTTP_404_NOT_FOUND
-        )
-    except Exception as e:
-        return Response(
-            {'error': str(e)},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+        return {
+            'user_message': ChatMessageSerializer(user_msg).data,
+            'assistant_message': ChatMessageSerializer(error_msg).data,
+            'error': str(e)
+        }, status.HTTP_500_INTERNAL_SERVER_ERROR
 
 
-@api_view(['POST'])
-def execute_csv_action(request):
-    """Execute a CSV action selected by the user."""
+def _respond_in_background(*args):
+    """Run _respond_to_message in a worker thread with its own database connection."""
+    close_old_connections()
     try:
-        session_id = request.data.get('session_id')
-        action_id = request.data.get('action_id')
-        csv_path = request.data.get('csv_path')
-        analysis = request.data.get('analysis', {})
-        
-        print(f"[DEBUG] execute_csv_action called")
-        print(f"[DEBUG] session_id: {session_id}")
-        print(f"[DEBUG] action_id: {action_id}")
-        print(f"[DEBUG] csv_path: {csv_path}")
-        print(f"[DEBUG] analysis keys: {analysis.keys() if analysis else 'None'}")
-        
-        if not all([session_id, action_id, csv_path]):
-            error_msg = f'Missing required fields: session_id={session_id}, action_id={action_id}, csv_path={csv_path}'
-            print(f"[ERROR] {error_msg}")
-            return Response(
-                {'error': 'session_id, action_id, and csv_path are required'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        session = ChatSession.objects.get(id=session_id)
-        print(f"[DEBUG] Session found: {session.id}")
-        
-        # Execute action using router agent
-        router = RouterAgent(
-            api_key=settings.GROQ_API_KEY,
-            base_dir=Path(settings.BASE_DIR)
-        )
-        
-        print(f"[DEBUG] Calling router.execute_csv_action...")
-        result = router.execute_csv_action(csv_path, action_id, analysis)
-        print(f"[DEBUG] Result status: {result.get('status')}")
-        print(f"[DEBUG] Result message: {result.get('message', 'No message')}")
-        
-        # Create assistant message with result
-        assistant_msg = _create_assistant_message(session, result)
-        print(f"[DEBUG] Assistant message created: {assistant_msg.id}")
-        
-        return Response({
-            'assistant_message': ChatMessageSerializer(assistant_msg).data,
-            'result': result
-        })
-        
-    except ChatSession.DoesNotExist:
-        print(f"[ERROR] Session not found: {session_id}")
-        return Response(
-            {'error': 'Session not found'},
-            status=status.HTTP_404_NOT_FOUND
-        )
-    except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
-        print(f"[ERROR] Exception in execute_csv_action:")
-        print(error_trace)
-        return Response(
-            {'error': str(e), 'traceback': error_trace},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+        return _respond_to_message(*args)
+    finally:
+        close_old_connections()
 
 
-def _handle_file_upload(session, message, uploaded_file):
-    """Handle file upload and return file info."""
-    file_ext = uploaded_file.name.lower().split('.')[-1]
-    file_type = 'pdf' if file_ext == 'pdf' else 'csv' if file_ext == 'csv' else 'other'
+def _save_uploaded_file(session, uploaded_file, message=None, status='processing'):
+    """Store an uploaded file and create its UploadedFile record."""
+    file_ext = os.path.splitext(uploaded_file.name)[1][1:].lower()
     
-    # Create UploadedFile record
-    file_record = UploadedFile.objects.create(
+    return UploadedFile.objects.create(
         session=session,
         message=message,
         file=uploaded_file,
-        file_type=file_type,
+        file_type=_FILE_TYPES.get(file_ext, 'other'),
         original_filename=uploaded_file.name,
-        status='processing'
+        status=status
     )
+
+
+def _handle_file_upload(session, message, uploaded_file):
+    """Handle file upload and return file info."""
+    file_record = _save_uploaded_file(session, uploaded_file, message=message)
     
     # Return file info for agent
     return {
         'path': file_record.file.path,
-        'type': file_type,
+        'type': file_record.file_type,
         'name': uploaded_file.name
     }
 
@@ -320,7 +444,8 @@ def _create_assistant_message(session, result):
         role='assistant',
         content=content,
         mode=mode,
-        metadata=result
+        metadata=result,
+        error_summary=str(result.get('message') or '')[:255] if mode == 'error' else ''
     )
 
 
@@ -364,7 +489,7 @@ def _format_csv_response(result):
     if result.get('status') != 'success':
         return f"Error: {result.get('message', 'Unknown error')}"
     
-    content = f"""CSV Analysis Complete!
+    header = f"""CSV Analysis Complete!
 
 **File:** {result.get('filename', 'Unknown')}
 **Content Summary:** {result.get('content_summary', 'N/A')}
@@ -376,11 +501,13 @@ def _format_csv_response(result):
 **Suggestions for working with this data:**
 """
     
-    suggestions = result.get('suggestions', [])
-    for suggestion in suggestions:
-        content += f"\n{suggestion.get('id')}. **{suggestion.get('title')}**: {suggestion.get('description')}"
+    parts = [header]
+    parts.extend(
+        f"\n{s.get('id')}. **{s.get('title')}**: {s.get('description')}"
+        for s in result.get('suggestions', [])
+    )
     
-    return content
+    return ''.join(parts)
 
 
 def _format_csv_action_response(result):
@@ -390,23 +517,22 @@ def _format_csv_action_response(result):
     
     action_name = result.get('action', 'CSV Action')
     
-    content = f"""✅ **{action_name} Completed!**
+    parts = [f"""✅ **{action_name} Completed!**
 
 {result.get('output', result.get('summary', 'Action executed successfully'))}
-"""
+"""]
     
     # Add files created if any
     if result.get('files_created'):
-        content += "\n\n**Files Created:**"
-        for file_path in result['files_created']:
-            from pathlib import Path
-            filename = Path(file_path).name
-            content += f"\n- `{filename}` - {file_path}"
+        parts.append("\n\n**Files Created:**")
+        parts.extend(
+            f"\n- `{os.path.basename(file_path)}` - {file_path}"
+            for file_path in result['files_created']
+        )
     
     # Add log file information
     if result.get('log_file'):
-        from pathlib import Path
-        log_filename = Path(result['log_file']).name
-        content += f"\n\n**📋 Execution Log:** `{log_filename}`\n*Check the terminal output or log file for detailed execution information.*"
+        log_filename = os.path.basename(result['log_file'])
+        parts.append(f"\n\n**📋 Execution Log:** `{log_filename}`\n*Check the terminal output or log file for detailed execution information.*")
     
-    return content
+    return ''.join(parts)
@@ -66,6 +66,9 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Keep connections open across requests instead of reconnecting per request
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -100,6 +103,11 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Stream every upload to a temporary file instead of buffering small ones in memory.
+# The temp dir is inside MEDIA_ROOT, so saving the upload is a rename, not a copy.
+FILE_UPLOAD_HANDLERS = ['django.core.files.uploadhandler.TemporaryFileUploadHandler']
+FILE_UPLOAD_TEMP_DIR = MEDIA_ROOT / '.upload_tmp'
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -114,6 +122,7 @@ REST_FRAMEWORK = {
         'rest_framework.parsers.MultiPartParser',
         'rest_framework.parsers.FormParser',
     ],
+    'EXCEPTION_HANDLER': 'chatbot.exceptions.handler',
 }
 
 # CORS settings (for development)
@@ -134,3 +143,4 @@ RAW_TEXT_DIR = BASE_DIR / 'raw_text'
 # Create directories if they don't exist
 GENERATED_CODE_DIR.mkdir(exist_ok=True)
 RAW_TEXT_DIR.mkdir(exist_ok=True)
+FILE_UPLOAD_TEMP_DIR.mkdir(parents=True, exist_ok=True)